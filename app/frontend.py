@@ -0,0 +1,137 @@
+"""
+Admin interface assets
+
+The admin page lives in app/static: admin.html is a template with the
+{api_token} and {asset_version} placeholders, CSS and JS are plain static
+files served from /static. Asset URLs carry a content hash (?v=...) so
+browsers can cache them permanently and pick up new builds immediately.
+The Docker image also ships brotli -q 11 (name.br) and gzip -9 (name.gz)
+copies of the CSS/JS, which are sent as-is to clients that accept them.
+"""
+
+import glob
+import gzip
+import hashlib
+import mimetypes
+import os
+import stat
+from functools import lru_cache
+
+import anyio
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse
+
+# Precompressed siblings, in order of preference: (Content-Encoding, suffix)
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+STATIC_DIR = os.path.join(os.path.dirname(__file__), "static")
+ADMIN_TEMPLATE = os.path.join(STATIC_DIR, "admin.html")
+ADMIN_ASSETS = (
+    os.path.join(STATIC_DIR, "css", "admin.css"),
+    os.path.join(STATIC_DIR, "js", "admin.js"),
+    # Per-page scripts, loaded on demand by admin.js
+    *sorted(glob.glob(os.path.join(STATIC_DIR, "js", "pages", "*.js"))),
+)
+
+
+@lru_cache(maxsize=1)
+def get_asset_version() -> str:
+    """Short content hash of the admin CSS and all admin scripts"""
+    digest = hashlib.sha256()
+    for path in ADMIN_ASSETS:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+@lru_cache(maxsize=1)
+def render_admin_page(api_token: str) -> str:
+    """Admin page HTML; rendered once per process"""
+    with open(ADMIN_TEMPLATE, encoding="utf-8") as f:
+        template = f.read()
+    return (
+        template
+        .replace("{asset_version}", get_asset_version())
+        .replace("{api_token}", api_token)
+    )
+
+
+@lru_cache(maxsize=1)
+def _admin_page_bytes(api_token: str):
+    """Encoded admin page, its gzip -9 copy and ETag; built once per process"""
+    body = render_admin_page(api_token).encode("utf-8")
+    etag = '"%s"' % hashlib.md5(body).hexdigest()
+    return body, gzip.compress(body, 9), etag
+
+
+def admin_page_response(request_headers, api_token: str) -> Response:
+    """
+    Admin page response served from memory
+
+    The page is revalidated on every load (it carries the asset hash), so
+    returning visitors get a bodyless 304 via the ETag.
+    """
+    body, gzipped, etag = _admin_page_bytes(api_token)
+    headers = {"Cache-Control": "no-cache", "ETag": etag, "Vary": "Accept-Encoding"}
+    if request_headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    if "gzip" in request_headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(gzipped, media_type="text/html", headers=headers)
+    return Response(body, media_type="text/html", headers=headers)
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles with Cache-Control headers
+
+    Versioned URLs (?v=<hash>) are immutable for a year; anything else is
+    revalidated on every use. A precompressed sibling (path + ".br" or
+    path + ".gz", brotli first) is served when the client accepts that
+    encoding and the copy is not older than the original, so the GZip
+    middleware has nothing left to do.
+    """
+
+    async def get_response(self, path, scope):
+        response = await self._precompressed_response(path, scope)
+        if response is None:
+            response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            if b"v=" in scope.get("query_string", b""):
+                response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+            else:
+                response.headers["Cache-Control"] = "no-cache"
+        return response
+
+    async def _precompressed_response(self, path, scope):
+        if scope["method"] not in ("GET", "HEAD"):
+            return None
+        request_headers = Headers(scope=scope)
+        accept_encoding = request_headers.get("accept-encoding", "")
+        encodings = [(name, suffix) for name, suffix in PRECOMPRESSED_ENCODINGS if name in accept_encoding]
+        if not encodings:
+            return None
+
+        full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path)
+        if not stat_result or not stat.S_ISREG(stat_result.st_mode):
+            return None
+
+        for encoding, suffix in encodings:
+            copy_path, copy_stat = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+            if not copy_stat or copy_stat.st_mtime < stat_result.st_mtime:
+                # Missing or stale copy (e.g. app/ mounted over the image in dev)
+                continue
+
+            response = FileResponse(
+                copy_path,
+                stat_result=copy_stat,
+                method=scope["method"],
+                media_type=mimetypes.guess_type(full_path)[0] or "application/octet-stream",
+                headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"},
+            )
+            if self.is_not_modified(response.headers, request_headers):
+                return NotModifiedResponse(response.headers)
+            return response
+        return None
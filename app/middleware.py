@@ -0,0 +1,34 @@
+"""
+HTTP middleware
+"""
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware as _GZipMiddleware, GZipResponder as _GZipResponder
+from starlette.types import Message, Receive, Scope, Send
+
+
+class _StreamAwareGZipResponder(_GZipResponder):
+    """GZip responder that leaves Server-Sent Events uncompressed"""
+
+    async def send_with_gzip(self, message: Message) -> None:
+        await super().send_with_gzip(message)
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            if content_type.startswith("text/event-stream"):
+                # gzip would hold frames in its buffer and delay progress updates
+                self.content_encoding_set = True
+
+
+class GZipMiddleware(_GZipMiddleware):
+    """starlette GZipMiddleware that passes text/event-stream responses through"""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            headers = Headers(scope=scope)
+            if "gzip" in headers.get("Accept-Encoding", ""):
+                responder = _StreamAwareGZipResponder(
+                    self.app, self.minimum_size, compresslevel=self.compresslevel
+                )
+                await responder(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
@@ -0,0 +1,98 @@
+"""
+Response shaping helpers
+"""
+
+import hashlib
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse, Response
+
+# Query values accepted by list endpoints that support the columnar format
+RESPONSE_FORMAT_PATTERN = "^(rows|columns)$"
+
+
+def to_columns(rows: List[Dict[str, Any]], fields: Sequence[str]) -> Dict[str, List[Any]]:
+    """
+    Convert a list of row dicts into column arrays
+
+    {"field": [row0["field"], row1["field"], ...], ...} avoids repeating key
+    names for every row and lets clients use the arrays directly.
+    """
+    return {field: [row[field] for row in rows] for field in fields}
+
+
+def lttb_indices(values: Sequence[float], threshold: int) -> List[int]:
+    """
+    Indices of the points to keep when thinning a series to threshold points
+
+    Largest-Triangle-Three-Buckets: the first and last points are always
+    kept; from each bucket in between the point forming the largest
+    triangle with the previously kept point and the next bucket's average
+    is chosen, so peaks and dips survive. x is the position in the series.
+    """
+    n = len(values)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    indices = [0]
+    bucket_size = (n - 2) / (threshold - 2)
+    previous = 0
+
+    for bucket in range(threshold - 2):
+        next_start = int((bucket + 1) * bucket_size) + 1
+        next_end = min(int((bucket + 2) * bucket_size) + 1, n)
+        avg_x = (next_start + next_end - 1) / 2
+        avg_y = sum(values[next_start:next_end]) / (next_end - next_start)
+
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        previous_y = values[previous]
+        chosen = max(
+            range(start, end),
+            key=lambda i: abs((previous - avg_x) * (values[i] - previous_y) - (previous - i) * (avg_y - previous_y))
+        )
+
+        indices.append(chosen)
+        previous = chosen
+
+    indices.append(n - 1)
+    return indices
+
+
+class AppJSONResponse(ORJSONResponse):
+    """
+    Default JSON response of the API, serialized with orjson
+
+    numpy scalars/arrays and naive datetimes (treated as UTC) are handled
+    natively for handlers that return data without FastAPI's encoder.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+        )
+
+
+def etag_json_response(content: Any, request_headers: Mapping[str, str], max_age: Optional[int] = None) -> Response:
+    """
+    JSON response with an ETag over its body
+
+    A client repeating a request with If-None-Match gets a bodyless 304
+    when the data has not changed. Responses are private (they depend on
+    the caller's API key) and, unless max_age is given, must be revalidated
+    on every use, so the browser cache never serves data from before a sync
+    or retrain. content
+    goes through jsonable_encoder like a plain handler return value, so
+    naive datetimes keep their offset-less form.
+    """
+    response = AppJSONResponse(jsonable_encoder(content))
+    etag = '"%s"' % hashlib.md5(response.body).hexdigest()
+    cache_control = "private, no-cache" if max_age is None else f"private, max-age={max_age}"
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if request_headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return response
@@ -1,23 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 from datetime import date, datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
 from pydantic import BaseModel
 import logging
 import traceback
 import csv
 import io
+import itertools
 
 from ..db import get_db
 from ..agents.sales_forecaster_agent import get_forecaster_agent
 from ..models.branch import Department, SalesSummary, PostprocessingSettings
 from ..auth import get_api_key_or_bypass, get_optional_api_key, ApiKey, log_api_usage
+from ..sse import EventStreamResponse, throttle_events
+from ..responses import RESPONSE_FORMAT_PATTERN, etag_json_response, to_columns
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/forecast", tags=["forecast"])
 
+COMPARISON_FIELDS = (
+    "date", "department_id", "department_name",
+    "predicted_sales", "actual_sales", "error", "error_percentage"
+)
+
 
 class RetrainRequest(BaseModel):
     handle_outliers: Optional[bool] = True
@@ -140,11 +149,15 @@ async def retrain_model(
 
 @router.get("/model/info")
 async def get_model_info(
+    request: Request,
     api_key: Optional[ApiKey] = Depends(get_api_key_or_bypass)
 ):
     """
     Get information about the current model
     
+    The response carries an ETag and may be reused for 30 seconds; it only
+    changes when the model is retrained.
+    
     Returns:
         Model status, features, and metadata
     """
@@ -153,7 +166,7 @@ async def get_model_info(
         model_info = forecaster.get_model_info()
         
         # Возвращаем все данные из model_info, включая training_metrics
-        return model_info
+        return etag_json_response(model_info, request.headers, max_age=30)
         
     except Exception as e:
         logger.error(f"Error getting model info: {str(e)}")
@@ -163,69 +176,152 @@ async def get_model_info(
         )
 
 
+# Sales rows fetched per round trip while building comparison rows
+COMPARISON_FETCH_ROWS = 500
+
+
+def _iter_comparison_rows(
+    db: Session,
+    from_date: date,
+    to_date: date,
+    department_id: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """Forecast vs actual sales rows with error metrics, yielded one by one"""
+    # Get actual sales data
+    sales_query = db.query(SalesSummary).filter(
+        and_(
+            SalesSummary.date >= from_date,
+            SalesSummary.date <= to_date
+        )
+    )
+    
+    if department_id:
+        sales_query = sales_query.filter(SalesSummary.department_id == department_id)
+    
+    # Department names in one query instead of one lookup per row
+    department_names = dict(db.query(Department.id, Department.name))
+    
+    # Get forecaster
+    forecaster = get_forecaster_agent()
+    
+    # Rows are fetched from a server-side cursor in batches, never all at once
+    for sale in sales_query.yield_per(COMPARISON_FETCH_ROWS):
+        # Get prediction
+        try:
+            prediction = forecaster.forecast(str(sale.department_id), sale.date, db)
+        except Exception as pred_error:
+            logger.warning(f"Failed to get prediction for {sale.date}, {sale.department_id}: {pred_error}")
+            prediction = None
+        
+        # Calculate error if we have both values
+        error = None
+        error_percentage = None
+        if prediction and sale.total_sales:
+            error = prediction - sale.total_sales
+            error_percentage = (abs(error) / sale.total_sales) * 100
+        
+        yield {
+            "date": sale.date.isoformat(),
+            "department_id": str(sale.department_id),
+            "department_name": department_names.get(sale.department_id, "Unknown"),
+            "predicted_sales": round(prediction, 2) if prediction else None,
+            "actual_sales": sale.total_sales,
+            "error": round(error, 2) if error else None,
+            "error_percentage": round(error_percentage, 2) if error_percentage else None
+        }
+
+
+def _iter_batch_forecast_rows(
+    db: Session,
+    from_date: date,
+    to_date: date,
+    department_id: Optional[str] = None,
+    skip: int = 0,
+    limit: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Forecast rows for a date range, ordered by date, then department
+
+    Rows are yielded as they are forecast; only rows skip .. skip + limit of
+    the (date, department) grid are computed. Raises 404 (on the first
+    next()) when no department matches.
+    """
+    # Get departments
+    departments_query = db.query(Department)
+    if department_id:
+        departments_query = departments_query.filter(Department.id == department_id)
+    
+    # Stable order, so that pages requested with skip/limit line up
+    departments = departments_query.order_by(Department.name, Department.id).all()
+    
+    if not departments:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No departments found"
+        )
+    
+    # Get forecaster
+    forecaster = get_forecaster_agent()
+    
+    departments_count = len(departments)
+    total = max((to_date - from_date).days + 1, 0) * departments_count
+    end = total if limit is None else min(total, skip + limit)
+    
+    for index in range(skip, end):
+        current_date = from_date + timedelta(days=index // departments_count)
+        dept = departments[index % departments_count]
+        try:
+            prediction = forecaster.forecast(str(dept.id), current_date, db)
+        except Exception as pred_error:
+            logger.warning(f"Failed to get prediction for {current_date}, {dept.id}: {pred_error}")
+            prediction = None
+        
+        logger.info(f"Prediction for {dept.name} on {current_date}: {prediction}")
+        
+        if prediction is None:
+            logger.warning(
+                f"No prediction available for department {dept.name} on {current_date}"
+            )
+        
+        yield {
+            "date": current_date.isoformat(),
+            "department_id": str(dept.id),
+            "department_name": dept.name,
+            "predicted_sales": round(prediction, 2) if prediction else None
+        }
+
+
 @router.get("/comparison")
 async def get_forecast_comparison(
+    request: Request,
     from_date: date,
     to_date: date,
     department_id: Optional[str] = None,
+    response_format: str = Query(
+        "rows", alias="format", pattern=RESPONSE_FORMAT_PATTERN,
+        description="rows: list of objects (default); columns: one array per field"
+    ),
     db: Session = Depends(get_db),
     api_key: Optional[ApiKey] = Depends(get_api_key_or_bypass)
 ):
     """
     Compare forecasts with actual sales
     
-    Returns comparison data with prediction error metrics
+    Returns comparison data with prediction error metrics,
+    as a list of rows or, with format=columns, one array per field.
+    The response carries an ETag, so a repeated request with
+    If-None-Match is answered with 304 when nothing changed.
     """
     try:
         # Log API usage if authenticated
         if api_key:
             log_api_usage(api_key, "/forecast/comparison", db=db)
-        # Get actual sales data
-        sales_query = db.query(SalesSummary).filter(
-            and_(
-                SalesSummary.date >= from_date,
-                SalesSummary.date <= to_date
-            )
-        )
-        
-        if department_id:
-            sales_query = sales_query.filter(SalesSummary.department_id == department_id)
         
-        sales_data = sales_query.all()
+        results = list(_iter_comparison_rows(db, from_date, to_date, department_id))
         
-        # Get forecaster
-        forecaster = get_forecaster_agent()
-        
-        results = []
-        for sale in sales_data:
-            # Get department info
-            department = db.query(Department).filter(Department.id == sale.department_id).first()
-            
-            # Get prediction
-            try:
-                prediction = forecaster.forecast(str(sale.department_id), sale.date, db)
-            except Exception as pred_error:
-                logger.warning(f"Failed to get prediction for {sale.date}, {sale.department_id}: {pred_error}")
-                prediction = None
-            
-            # Calculate error if we have both values
-            error = None
-            error_percentage = None
-            if prediction and sale.total_sales:
-                error = prediction - sale.total_sales
-                error_percentage = (abs(error) / sale.total_sales) * 100
-            
-            results.append({
-                "date": sale.date.isoformat(),
-                "department_id": str(sale.department_id),
-                "department_name": department.name if department else "Unknown",
-                "predicted_sales": round(prediction, 2) if prediction else None,
-                "actual_sales": sale.total_sales,
-                "error": round(error, 2) if error else None,
-                "error_percentage": round(error_percentage, 2) if error_percentage else None
-            })
-        
-        return results
+        if response_format == "columns":
+            return etag_json_response(to_columns(results, COMPARISON_FIELDS), request.headers)
+        return etag_json_response(results, request.headers)
         
     except Exception as e:
         logger.error(f"Error getting forecast comparison: {str(e)}")
@@ -237,15 +333,22 @@ async def get_forecast_comparison(
 
 @router.get("/batch")
 async def get_batch_forecasts(
+    request: Request,
     from_date: date,
     to_date: date,
     department_id: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=10000),
     db: Session = Depends(get_db),
     api_key: Optional[ApiKey] = Depends(get_api_key_or_bypass)
 ):
     """
     Get batch forecasts for a date range
     
+    Rows are ordered by date, then department. With skip/limit only that
+    page of rows is forecast, so a client can load a long period page by page.
+    Like the comparison, the response carries an ETag for If-None-Match.
+    
     Returns:
         List of forecasts for the specified period
     """
@@ -253,50 +356,10 @@ async def get_batch_forecasts(
         # Log API usage if authenticated
         if api_key:
             log_api_usage(api_key, "/forecast/batch", db=db)
-        # Get departments
-        departments_query = db.query(Department)
-        if department_id:
-            departments_query = departments_query.filter(Department.id == department_id)
-        
-        departments = departments_query.all()
-        
-        if not departments:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="No departments found"
-            )
         
-        # Get forecaster
-        forecaster = get_forecaster_agent()
-        
-        results = []
-        current_date = from_date
-        
-        while current_date <= to_date:
-            for dept in departments:
-                try:
-                    prediction = forecaster.forecast(str(dept.id), current_date, db)
-                except Exception as pred_error:
-                    logger.warning(f"Failed to get prediction for {current_date}, {dept.id}: {pred_error}")
-                    prediction = None
-                
-                logger.info(f"Prediction for {dept.name} on {current_date}: {prediction}")
-                
-                if prediction is None:
-                    logger.warning(
-                        f"No prediction available for department {dept.name} on {current_date}"
-                    )
-                
-                results.append({
-                    "date": current_date.isoformat(),
-                    "department_id": str(dept.id),
-                    "department_name": dept.name,
-                    "predicted_sales": round(prediction, 2) if prediction else None
-                })
-            
-            current_date += timedelta(days=1)
+        results = list(_iter_batch_forecast_rows(db, from_date, to_date, department_id, skip, limit))
         
-        return results
+        return etag_json_response(results, request.headers)
         
     except Exception as e:
         logger.error(f"Error getting batch forecasts: {str(e)}")
@@ -306,6 +369,38 @@ async def get_batch_forecasts(
         )
 
 
+# Rows per chunk of a streamed CSV export
+CSV_EXPORT_CHUNK_ROWS = 200
+
+
+def _iter_csv(rows: Iterator[Dict[str, Any]], fieldnames: List[str]) -> Iterator[str]:
+    """
+    CSV text of rows (header first) in chunks of CSV_EXPORT_CHUNK_ROWS lines
+    
+    If building the rows fails midway, an ERROR row is written and the error
+    is re-raised so the connection is aborted: the client sees a failed
+    download rather than a file that looks complete.
+    """
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=fieldnames, extrasaction="ignore")
+    writer.writeheader()
+    
+    try:
+        for count, row in enumerate(rows, 1):
+            writer.writerow(row)
+            if count % CSV_EXPORT_CHUNK_ROWS == 0:
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
+    except Exception as e:
+        logger.error(f"CSV export aborted: {str(e)}")
+        writer.writerow({fieldnames[0]: f"ERROR: export incomplete: {e}"})
+        yield output.getvalue()
+        raise
+    
+    yield output.getvalue()
+
+
 @router.get("/export/csv")
 async def export_forecasts_csv(
     from_date: date,
@@ -318,55 +413,31 @@ async def export_forecasts_csv(
     """
     Export forecasts to CSV format
     
+    The file is streamed: rows are written out as they are forecast, so the
+    download starts right away and the server never holds the whole file.
+    
     Returns:
         CSV file with forecast data
     """
     try:
         # Get forecast data
         if include_actual:
-            # Get comparison data
-            comparison_data = await get_forecast_comparison(from_date, to_date, department_id, db)
-            
-            # Create CSV output
-            output = io.StringIO()
+            rows = _iter_comparison_rows(db, from_date, to_date, department_id)
             fieldnames = ['date', 'department_name', 'predicted_sales', 'actual_sales', 'error', 'error_percentage']
-            writer = csv.DictWriter(output, fieldnames=fieldnames)
-            
-            writer.writeheader()
-            for row in comparison_data:
-                writer.writerow({
-                    'date': row['date'],
-                    'department_name': row['department_name'],
-                    'predicted_sales': row['predicted_sales'],
-                    'actual_sales': row['actual_sales'],
-                    'error': row['error'],
-                    'error_percentage': row['error_percentage']
-                })
-            
             filename = f"forecast_comparison_{from_date}_{to_date}.csv"
         else:
-            # Get forecast data only
-            forecast_data = await get_batch_forecasts(from_date, to_date, department_id, db)
-            
-            # Create CSV output
-            output = io.StringIO()
+            rows = _iter_batch_forecast_rows(db, from_date, to_date, department_id)
             fieldnames = ['date', 'department_name', 'predicted_sales']
-            writer = csv.DictWriter(output, fieldnames=fieldnames)
-            
-            writer.writeheader()
-            for row in forecast_data:
-                writer.writerow({
-                    'date': row['date'],
-                    'department_name': row['department_name'],
-                    'predicted_sales': row['predicted_sales']
-                })
-            
             filename = f"forecast_{from_date}_{to_date}.csv"
         
-        # Return CSV response
-        csv_content = output.getvalue()
-        return Response(
-            content=csv_content,
+        # The first row is taken here, so lookup errors (e.g. no departments)
+        # still become an error response instead of a cut-off download
+        first_row = next(rows, None)
+        if first_row is not None:
+            rows = itertools.chain([first_row], rows)
+        
+        return StreamingResponse(
+            _iter_csv(rows, fieldnames),
             media_type="text/csv",
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
@@ -844,6 +915,65 @@ async def postprocess_batch_forecasts(
         )
 
 
+@router.post("/postprocess/batch/stream")
+async def postprocess_batch_forecasts_stream(
+    forecasts: List[Dict[str, Any]],
+    apply_smoothing: bool = True,
+    apply_business_rules: bool = True,
+    apply_anomaly_detection: bool = True,
+    calculate_confidence: bool = True,
+    db: Session = Depends(get_db),
+    api_key: Optional[ApiKey] = Depends(get_api_key_or_bypass)
+):
+    """
+    Apply post-processing to a batch of forecasts, streaming progress as Server-Sent Events
+    
+    Same input as /postprocess/batch. Progress frames ({"processed", "total",
+    "pct", "msg"}, pct from 0 to 100 as in the other streams) are sent at most
+    10 times per second; the final frame has "done": true and carries the results.
+    
+    Returns:
+        text/event-stream response
+    """
+    from ..services.forecast_postprocessing_service import get_forecast_postprocessing_service
+    
+    postprocessing_service = get_forecast_postprocessing_service(db)
+    total = len(forecasts)
+    
+    def frames():
+        results = []
+        try:
+            for index, processed in postprocessing_service.iter_batch_process_forecasts(
+                forecasts,
+                apply_smoothing=apply_smoothing,
+                apply_business_rules=apply_business_rules,
+                apply_anomaly_detection=apply_anomaly_detection,
+                calculate_confidence=calculate_confidence
+            ):
+                results.append(processed)
+                yield {
+                    "processed": index + 1,
+                    "total": total,
+                    "pct": (index + 1) * 100 // total,
+                    "msg": f"Обработано {index + 1} из {total}"
+                }
+            
+            yield {
+                "done": True,
+                "pct": 100,
+                "status": "success",
+                "processed_count": len(results),
+                "results": results
+            }
+            
+        except Exception as e:
+            logger.error(f"Error in streaming batch post-processing: {str(e)}")
+            logger.error(f"Traceback: {traceback.format_exc()}")
+            yield {"done": True, "pct": 100, "status": "error", "detail": str(e)}
+    
+    return EventStreamResponse(throttle_events(frames()))
+
+
 class PostprocessingOptionsRequest(BaseModel):
     apply_smoothing: Optional[bool] = True
     apply_business_rules: Optional[bool] = True
@@ -873,7 +1003,7 @@ async def get_batch_forecasts_with_postprocessing(
         if api_key:
             log_api_usage(api_key, "/forecast/batch_with_postprocessing", db=db)
         # Get raw forecasts first
-        raw_forecasts = await get_batch_forecasts(from_date, to_date, department_id, db)
+        raw_forecasts = list(_iter_batch_forecast_rows(db, from_date, to_date, department_id))
         
         if not apply_postprocessing:
             return raw_forecasts
@@ -7,12 +7,16 @@ from sqlalchemy.orm import Session
 from datetime import date, datetime, timedelta
 from typing import Optional, Dict, Any
 from pydantic import BaseModel
+import asyncio
 import logging
 
 from ..db import get_db
 from ..services.model_monitoring_service import get_model_monitoring_service
 from ..services.model_retraining_service import model_retrainer
+from ..agents.sales_forecaster_agent import get_forecaster_agent
 from ..auth import get_api_key_or_bypass, ApiKey
+from ..responses import lttb_indices
+from ..sse import EventStreamResponse, sse_event
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +57,10 @@ async def get_model_health(
 @router.get("/performance/summary")
 async def get_performance_summary(
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
+    downsample: Optional[int] = Query(
+        None, ge=3, le=365,
+        description="Thin time_series to this many points (LTTB on MAPE)"
+    ),
     db: Session = Depends(get_db),
     api_key: Optional[ApiKey] = Depends(get_api_key_or_bypass)
 ):
@@ -61,6 +69,8 @@ async def get_performance_summary(
     
     Args:
         days: Number of days to analyze (1-365)
+        downsample: Optional number of time series points to return; the
+            summary statistics are still computed over every day
         
     Returns:
         Performance metrics and time series data
@@ -69,6 +79,11 @@ async def get_performance_summary(
         monitoring_service = get_model_monitoring_service()
         summary = monitoring_service.get_performance_summary(days=days, db=db)
         
+        time_series = summary.get("time_series")
+        if downsample and time_series:
+            keep = lttb_indices([point["mape"] for point in time_series], downsample)
+            summary["time_series"] = [time_series[i] for i in keep]
+        
         return summary
         
     except Exception as e:
@@ -120,7 +135,8 @@ async def trigger_manual_retrain(
         request: Retraining configuration
         
     Returns:
-        Retraining results and deployment decision
+        Retraining results and deployment decision; 409 if a retrain is
+        already running
     """
     try:
         logger.info(f"Manual retraining triggered. Reason: {request.reason}")
@@ -135,14 +151,105 @@ async def trigger_manual_retrain(
             performance_threshold=request.performance_threshold
         )
         
-        return result
-        
     except Exception as e:
         logger.error(f"Error in manual retraining: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error in manual retraining: {str(e)}"
         )
+    
+    if result.get('status') == 'busy':
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=result['message'])
+    
+    return result
+
+
+@router.post("/retrain/manual/stream")
+async def trigger_manual_retrain_stream(
+    request: ManualRetrainRequest = ManualRetrainRequest(),
+    api_key: Optional[ApiKey] = Depends(get_api_key_or_bypass)
+):
+    """
+    Manually trigger model retraining, streaming progress as Server-Sent Events
+    
+    Same body as /retrain/manual. Progress frames carry {"pct", "msg"}; the
+    final frame has "done": true plus the /retrain/manual result. Retraining
+    runs in a worker thread so the server keeps answering other requests,
+    and the open stream stops proxies from timing out. Only one retrain runs
+    at a time: 409 if one is already in progress (a retrain that wins the
+    race in between ends the stream with status "busy").
+    """
+    if model_retrainer.retrain_in_progress:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Model retraining is already in progress"
+        )
+    
+    queue: asyncio.Queue = asyncio.Queue()
+    loop = asyncio.get_running_loop()
+    
+    def progress(pct: int, msg: str):
+        loop.call_soon_threadsafe(queue.put_nowait, {"pct": pct, "msg": msg})
+    
+    async def run_retrain():
+        logger.info(f"Manual retraining triggered (stream). Reason: {request.reason}")
+        try:
+            result = await asyncio.to_thread(
+                model_retrainer.retrain_model_sync,
+                trigger_type='manual',
+                trigger_details={
+                    'reason': request.reason,
+                    'force_deploy': request.force_deploy,
+                    'triggered_at': datetime.utcnow().isoformat()
+                },
+                performance_threshold=request.performance_threshold,
+                progress=progress
+            )
+        except Exception as e:
+            logger.error(f"Error in manual retraining: {str(e)}")
+            result = {"status": "error", "message": f"Error in manual retraining: {str(e)}"}
+        queue.put_nowait({"done": True, "pct": 100, **result})
+    
+    async def events():
+        # Not cancelled on disconnect: the worker thread cannot be stopped
+        # and the retrain still deploys or archives its model
+        task = asyncio.create_task(run_retrain())
+        while True:
+            frame = await queue.get()
+            yield sse_event(frame)
+            if frame.get("done"):
+                break
+        await task
+    
+    return EventStreamResponse(events())
+
+
+def _retrain_status() -> Dict[str, Any]:
+    """Scheduled retraining jobs and the last retrain result"""
+    # Get scheduler info
+    from ..main import scheduler
+    
+    jobs = []
+    for job in scheduler.get_jobs():
+        if 'retrain' in job.id:
+            jobs.append({
+                'id': job.id,
+                'name': job.name,
+                'next_run': job.next_run_time.isoformat() if job.next_run_time else None,
+                'trigger': str(job.trigger)
+            })
+    
+    # TODO: Get last retrain info from database when tables are created
+    last_retrain = {
+        'status': 'No retraining history available',
+        'message': 'Model retraining log table not yet implemented'
+    }
+    
+    return {
+        'scheduled_jobs': jobs,
+        'last_retrain': last_retrain,
+        'current_time': datetime.utcnow().isoformat()
+    }
 
 
 @router.get("/retrain/status")
@@ -156,30 +263,7 @@ async def get_retrain_status(
         Retraining schedule information and history
     """
     try:
-        # Get scheduler info
-        from ..main import scheduler
-        
-        jobs = []
-        for job in scheduler.get_jobs():
-            if 'retrain' in job.id:
-                jobs.append({
-                    'id': job.id,
-                    'name': job.name,
-                    'next_run': job.next_run_time.isoformat() if job.next_run_time else None,
-                    'trigger': str(job.trigger)
-                })
-        
-        # TODO: Get last retrain info from database when tables are created
-        last_retrain = {
-            'status': 'No retraining history available',
-            'message': 'Model retraining log table not yet implemented'
-        }
-        
-        return {
-            'scheduled_jobs': jobs,
-            'last_retrain': last_retrain,
-            'current_time': datetime.utcnow().isoformat()
-        }
+        return _retrain_status()
         
     except Exception as e:
         logger.error(f"Error getting retrain status: {str(e)}")
@@ -189,6 +273,51 @@ async def get_retrain_status(
         )
 
 
+def _daily_alerts(days: int) -> Dict[str, Any]:
+    """Days with performance alerts in the last `days` days (blocking; run in a worker thread)"""
+    monitoring_service = get_model_monitoring_service()
+    
+    # Calculate metrics for recent days to check for alerts
+    alerts_summary = []
+    end_date = date.today()
+    start_date = end_date - timedelta(days=days)
+    
+    current_date = start_date
+    while current_date <= end_date:
+        try:
+            metrics = monitoring_service.calculate_daily_metrics_sync(current_date)
+            if metrics.get('has_alerts'):
+                alerts_summary.append({
+                    'date': current_date.isoformat(),
+                    'alerts': metrics.get('alerts', []),
+                    'daily_mape': metrics.get('daily_mape', 0)
+                })
+        except:
+            # Skip if no data for that date
+            pass
+        
+        current_date += timedelta(days=1)
+    
+    return {
+        'period_days': days,
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+        'daily_alerts': alerts_summary
+    }
+
+
+def _recent_alerts_response(alerts: Dict[str, Any], health: Dict[str, Any]) -> Dict[str, Any]:
+    """/alerts/recent payload from _daily_alerts and a health check"""
+    return {
+        'period_days': alerts['period_days'],
+        'start_date': alerts['start_date'],
+        'end_date': alerts['end_date'],
+        'current_health': health.get('overall_status'),
+        'daily_alerts': alerts['daily_alerts'],
+        'total_alert_days': len(alerts['daily_alerts'])
+    }
+
+
 @router.get("/alerts/recent")
 async def get_recent_alerts(
     days: int = Query(7, ge=1, le=30, description="Number of days to check"),
@@ -205,40 +334,12 @@ async def get_recent_alerts(
         List of recent alerts and their details
     """
     try:
-        monitoring_service = get_model_monitoring_service()
-        
-        # Calculate metrics for recent days to check for alerts
-        alerts_summary = []
-        end_date = date.today()
-        start_date = end_date - timedelta(days=days)
-        
-        current_date = start_date
-        while current_date <= end_date:
-            try:
-                metrics = await monitoring_service.calculate_daily_metrics(current_date)
-                if metrics.get('has_alerts'):
-                    alerts_summary.append({
-                        'date': current_date.isoformat(),
-                        'alerts': metrics.get('alerts', []),
-                        'daily_mape': metrics.get('daily_mape', 0)
-                    })
-            except:
-                # Skip if no data for that date
-                pass
-            
-            current_date += timedelta(days=1)
+        alerts = await asyncio.to_thread(_daily_alerts, days)
         
         # Get current health status
-        health = monitoring_service.check_model_health(db)
+        health = get_model_monitoring_service().check_model_health(db)
         
-        return {
-            'period_days': days,
-            'start_date': start_date.isoformat(),
-            'end_date': end_date.isoformat(),
-            'current_health': health.get('overall_status'),
-            'daily_alerts': alerts_summary,
-            'total_alert_days': len(alerts_summary)
-        }
+        return _recent_alerts_response(alerts, health)
         
     except Exception as e:
         logger.error(f"Error getting recent alerts: {str(e)}")
@@ -276,4 +377,55 @@ async def get_model_comparison(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error comparing models: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+@router.get("/dashboard")
+async def get_monitoring_dashboard(
+    days: int = Query(30, ge=1, le=365, description="Number of days for the performance summary"),
+    alert_days: int = Query(7, ge=1, le=30, description="Number of days to check for alerts"),
+    api_key: Optional[ApiKey] = Depends(get_api_key_or_bypass)
+):
+    """
+    Everything a monitoring dashboard needs in one response
+    
+    Runs the health check, performance summary, recent alerts, retrain
+    status and model info concurrently, each in a worker thread with its own
+    database session. The alerts section reuses the health check. The
+    individual endpoints stay available.
+    
+    Sharing state across those threads is safe: the monitoring service is a
+    plain per-request instance that only holds alert thresholds and opens a
+    session per call, and the forecaster singleton is only read
+    (get_model_info). The forecaster is created
+    first, in a thread of its own, so the threads never race on its lazy
+    construction and the model load never runs on the event loop.
+    
+    Returns:
+        health, performance, alerts, retrain and model sections
+    """
+    try:
+        monitoring_service = get_model_monitoring_service()
+        forecaster = await asyncio.to_thread(get_forecaster_agent)
+        health, performance, alerts, retrain, model = await asyncio.gather(
+            asyncio.to_thread(monitoring_service.check_model_health),
+            asyncio.to_thread(monitoring_service.get_performance_summary, days),
+            asyncio.to_thread(_daily_alerts, alert_days),
+            asyncio.to_thread(_retrain_status),
+            asyncio.to_thread(forecaster.get_model_info)
+        )
+        
+        return {
+            'health': health,
+            'performance': performance,
+            'alerts': _recent_alerts_response(alerts, health),
+            'retrain': retrain,
+            'model': model
+        }
+        
+    except Exception as e:
+        logger.error(f"Error getting monitoring dashboard: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error getting monitoring dashboard: {str(e)}"
+        )
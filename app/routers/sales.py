@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Request
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from typing import List, Optional
@@ -8,12 +8,18 @@ from ..models.branch import SalesSummary as SalesSummaryModel, SalesByHour as Sa
 from ..schemas.branch import SalesSummary, SalesByHour
 from ..services.iiko_sales_loader import IikoSalesLoaderService
 from ..auth import get_api_key_or_bypass, ApiKey
+from ..responses import RESPONSE_FORMAT_PATTERN, etag_json_response, to_columns
+from ..sse import EventStreamResponse, sse_event
+import asyncio
 import logging
 from typing import Optional as OptionalType
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/sales", tags=["sales"])
 
+SUMMARY_FIELDS = ("id", "department_id", "date", "total_sales", "created_at", "updated_at", "synced_at")
+HOURLY_FIELDS = ("id", "department_id", "date", "hour", "sales_amount", "created_at", "updated_at", "synced_at")
+
 
 @router.get("/summary")
 def get_sales_summary(
@@ -22,6 +28,10 @@ def get_sales_summary(
     department_id: Optional[str] = None,
     from_date: Optional[date] = None,
     to_date: Optional[date] = None,
+    response_format: str = Query(
+        "rows", alias="format", pattern=RESPONSE_FORMAT_PATTERN,
+        description="rows: list of objects (default); columns: one array per field"
+    ),
     db: Session = Depends(get_db),
     api_key: OptionalType[ApiKey] = Depends(get_api_key_or_bypass)
 ):
@@ -53,6 +63,8 @@ def get_sales_summary(
         }
         result.append(sale_dict)
     
+    if response_format == "columns":
+        return to_columns(result, SUMMARY_FIELDS)
     return result
 
 
@@ -64,6 +76,10 @@ def get_sales_by_hour(
     from_date: Optional[date] = None,
     to_date: Optional[date] = None,
     hour: Optional[int] = Query(None, ge=0, le=23),
+    response_format: str = Query(
+        "rows", alias="format", pattern=RESPONSE_FORMAT_PATTERN,
+        description="rows: list of objects (default); columns: one array per field"
+    ),
     db: Session = Depends(get_db),
     api_key: OptionalType[ApiKey] = Depends(get_api_key_or_bypass)
 ):
@@ -99,9 +115,62 @@ def get_sales_by_hour(
         }
         result.append(sale_dict)
     
+    if response_format == "columns":
+        return to_columns(result, HOURLY_FIELDS)
     return result
 
 
+def _sync_response(result: dict, from_date: Optional[date], to_date: Optional[date]) -> dict:
+    """Shape the sales loader result for the API"""
+    logger.info(f"API endpoint: Sync completed with status: {result.get('status')}")
+    
+    # Check if sync failed
+    if result.get("status") == "error":
+        logger.error(f"API endpoint: Sync failed with error: {result.get('message')}")
+        # Return error with detailed information
+        return {
+            "status": "error",
+            "message": result.get("message", "Unknown error occurred"),
+            "from_date": from_date,
+            "to_date": to_date,
+            "summary_records": result.get("summary_records", 0),
+            "hourly_records": result.get("hourly_records", 0),
+            "total_raw_records": result.get("total_raw_records", 0),
+            "details": result.get("details", "No additional details available"),
+            "error_type": result.get("error_type", "UnknownError")
+        }
+    
+    # Success case
+    return {
+        "status": "success",
+        "message": result.get("message", "Sync completed successfully"),
+        "from_date": from_date,
+        "to_date": to_date,
+        "summary_records": result.get("summary_records", 0),
+        "hourly_records": result.get("hourly_records", 0),
+        "total_raw_records": result.get("total_raw_records", 0),
+        "details": result.get("details", f"Successfully processed {result.get('total_raw_records', 0)} records")
+    }
+
+
+def _sync_error_response(e: Exception, from_date: Optional[date], to_date: Optional[date]) -> dict:
+    """Detailed error payload for unexpected sync failures"""
+    logger.error(f"Critical error in sales sync endpoint: {e}", exc_info=True)
+    
+    # Return detailed error information instead of raising HTTP exception
+    return {
+        "status": "error",
+        "message": f"Critical system error during sync: {str(e)}",
+        "from_date": from_date,
+        "to_date": to_date,
+        "summary_records": 0,
+        "hourly_records": 0,
+        "total_raw_records": 0,
+        "details": f"A critical error occurred in the API endpoint. Error type: {type(e).__name__}. Please check server logs for more information.",
+        "error_type": type(e).__name__
+    }
+
+
 @router.post("/sync")
 async def sync_sales(
     from_date: Optional[date] = Query(None, description="Start date for sync (default: yesterday)"),
@@ -119,53 +188,56 @@ async def sync_sales(
 
         # Perform sync
         result = await sales_loader.sync_sales(from_date, to_date, department_id)
-        
-        logger.info(f"API endpoint: Sync completed with status: {result.get('status')}")
-        
-        # Check if sync failed
-        if result.get("status") == "error":
-            logger.error(f"API endpoint: Sync failed with error: {result.get('message')}")
-            # Return error with detailed information
-            return {
-                "status": "error",
-                "message": result.get("message", "Unknown error occurred"),
-                "from_date": from_date,
-                "to_date": to_date,
-                "summary_records": result.get("summary_records", 0),
-                "hourly_records": result.get("hourly_records", 0),
-                "total_raw_records": result.get("total_raw_records", 0),
-                "details": result.get("details", "No additional details available"),
-                "error_type": result.get("error_type", "UnknownError")
-            }
-        
-        # Success case
-        return {
-            "status": "success",
-            "message": result.get("message", "Sync completed successfully"),
-            "from_date": from_date,
-            "to_date": to_date,
-            "summary_records": result.get("summary_records", 0),
-            "hourly_records": result.get("hourly_records", 0),
-            "total_raw_records": result.get("total_raw_records", 0),
-            "details": result.get("details", f"Successfully processed {result.get('total_raw_records', 0)} records")
-        }
+        return _sync_response(result, from_date, to_date)
         
     except Exception as e:
-        error_msg = f"API endpoint error: {str(e)}"
-        logger.error(f"Critical error in sales sync endpoint: {e}", exc_info=True)
-        
-        # Return detailed error information instead of raising HTTP exception
-        return {
-            "status": "error",
-            "message": f"Critical system error during sync: {str(e)}",
-            "from_date": from_date,
-            "to_date": to_date,
-            "summary_records": 0,
-            "hourly_records": 0,
-            "total_raw_records": 0,
-            "details": f"A critical error occurred in the API endpoint. Error type: {type(e).__name__}. Please check server logs for more information.",
-            "error_type": type(e).__name__
-        }
+        return _sync_error_response(e, from_date, to_date)
+
+
+@router.post("/sync/stream")
+async def sync_sales_stream(
+    from_date: Optional[date] = Query(None, description="Start date for sync (default: yesterday)"),
+    to_date: Optional[date] = Query(None, description="End date for sync (default: same as from_date)"),
+    department_id: Optional[str] = Query(None, description="Department ID to sync (default: all departments)"),
+    db: Session = Depends(get_db),
+    api_key: OptionalType[ApiKey] = Depends(get_api_key_or_bypass)
+):
+    """
+    Sync sales data from iiko API, streaming progress as Server-Sent Events
+    
+    Same parameters as /sync. Progress frames carry {"pct", "msg"}; the final
+    frame has "done": true plus the /sync response fields. Keeping the stream
+    open also stops proxies from timing out long syncs.
+    """
+    sales_loader = IikoSalesLoaderService(db)
+    queue: asyncio.Queue = asyncio.Queue()
+    
+    def progress(pct: int, msg: str):
+        queue.put_nowait({"pct": pct, "msg": msg})
+    
+    async def run_sync():
+        try:
+            logger.info(f"API endpoint: Starting streamed sales sync from {from_date} to {to_date}, department_id={department_id}")
+            result = await sales_loader.sync_sales(from_date, to_date, department_id, progress=progress)
+            response = _sync_response(result, from_date, to_date)
+        except Exception as e:
+            response = _sync_error_response(e, from_date, to_date)
+        queue.put_nowait({"done": True, "pct": 100, **response})
+    
+    async def events():
+        task = asyncio.create_task(run_sync())
+        try:
+            while True:
+                frame = await queue.get()
+                yield sse_event(frame)
+                if frame.get("done"):
+                    break
+        finally:
+            if not task.done():
+                # Client went away mid-sync
+                task.cancel()
+    
+    return EventStreamResponse(events())
 
 
 @router.get("/stats")
@@ -256,12 +328,19 @@ def delete_sales_hourly(
 
 @router.get("/auto-sync/status")
 def get_auto_sync_status(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     db: Session = Depends(get_db),
     api_key: OptionalType[ApiKey] = Depends(get_api_key_or_bypass)
 ):
-    """Get automatic sync logs and status"""
+    """
+    Get automatic sync logs and status
+    
+    The log only changes once a day (or on a test run), so the response
+    carries an ETag; the admin page reuses it for 30 seconds on its own and
+    revalidates after that.
+    """
     try:
         # Get recent auto sync logs
         logs = db.query(AutoSyncLog).order_by(AutoSyncLog.executed_at.desc()).offset(skip).limit(limit).all()
@@ -306,7 +385,7 @@ def get_auto_sync_status(
             }
             log_list.append(log_dict)
         
-        return {
+        return etag_json_response({
             "logs": log_list,
             "statistics": {
                 "total_logs": len(log_list),
@@ -326,7 +405,7 @@ def get_auto_sync_status(
                     "error_details": latest_error.error_details if latest_error else None
                 } if latest_error else None
             }
-        }
+        }, request.headers)
         
     except Exception as e:
         logger.error(f"Error getting auto sync status: {e}")
@@ -16,7 +16,7 @@ import numpy as np
 from datetime import datetime, date, timedelta
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, func, desc
-from typing import Optional, Dict, List, Tuple, Any
+from typing import Optional, Dict, List, Tuple, Any, Iterator
 import logging
 import warnings
 from scipy import stats
@@ -159,9 +159,22 @@ class ForecastPostprocessingService:
         Returns:
             List of processed forecasts
         """
-        processed_forecasts = []
+        return [
+            processed for _, processed in self.iter_batch_process_forecasts(forecasts, **processing_options)
+        ]
+    
+    def iter_batch_process_forecasts(
+        self,
+        forecasts: List[Dict[str, Any]],
+        **processing_options
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Post-process forecasts one by one, yielding (index, result) pairs
         
-        for forecast in forecasts:
+        Used by batch_process_forecasts and by the streaming endpoint that
+        reports progress while the batch is running.
+        """
+        for index, forecast in enumerate(forecasts):
             try:
                 processed = self.process_forecast(
                     branch_id=forecast['branch_id'],
@@ -169,16 +182,14 @@ class ForecastPostprocessingService:
                     raw_prediction=forecast['prediction'],
                     **processing_options
                 )
-                processed_forecasts.append(processed)
                 
             except Exception as e:
                 logger.error(f"Error processing forecast {forecast}: {str(e)}")
                 # Add error result
-                error_result = forecast.copy()
-                error_result['error'] = str(e)
-                processed_forecasts.append(error_result)
-        
-        return processed_forecasts
+                processed = forecast.copy()
+                processed['error'] = str(e)
+            
+            yield index, processed
     
     def _get_historical_context(
         self, 
@@ -1,7 +1,9 @@
+import asyncio
 import httpx
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional, Tuple
 from datetime import datetime, date, timedelta
+from ..db import SessionLocal
 from ..models.branch import SalesSummary, SalesByHour, Department
 from ..services.iiko_auth import IikoAuthService
 import logging
@@ -10,6 +12,9 @@ from collections import defaultdict
 
 logger = logging.getLogger(__name__)
 
+# progress(pct, message) callback used to report sync stages to the UI
+ProgressCallback = Callable[[int, str], None]
+
 
 class IikoSalesLoaderService:
     def __init__(self, db: Session):
@@ -85,13 +90,18 @@ class IikoSalesLoaderService:
             logger.error(f"Unexpected error from {base_url}: {e}")
             return []
     
-    async def fetch_sales_from_iiko(self, from_date: date, to_date: date) -> List[dict]:
+    async def fetch_sales_from_iiko(
+        self,
+        from_date: date,
+        to_date: date,
+        progress: Optional[ProgressCallback] = None
+    ) -> List[dict]:
         """Fetch sales data from all iiko domains"""
         all_sales = []
         
         logger.info(f"Fetching sales from {len(self.domains)} domains")
         
-        for domain in self.domains:
+        for index, domain in enumerate(self.domains):
             try:
                 logger.info(f"Trying to fetch from domain: {domain}")
                 sales = await self.fetch_sales_from_single_domain(domain, from_date, to_date)
@@ -101,6 +111,13 @@ class IikoSalesLoaderService:
                 logger.error(f"Failed to fetch sales from {domain}: {e}")
                 # Continue with other domains even if one fails
                 continue
+            finally:
+                if progress:
+                    # Fetching covers 10-60% of the sync
+                    progress(
+                        10 + 50 * (index + 1) // len(self.domains),
+                        f"Получены данные {index + 1} из {len(self.domains)} источников iiko"
+                    )
         
         logger.info(f"Total fetched {len(all_sales)} sales records from all domains")
         logger.info(f"About to return sales data: {all_sales is not None}")
@@ -234,15 +251,64 @@ class IikoSalesLoaderService:
         logger.info(f"Synced {new_count} new and {updated_count} updated hourly sales records")
         return new_count + updated_count
     
-    async def sync_sales(self, from_date: date = None, to_date: date = None, department_id: str = None) -> dict:
+    def _process_and_store(
+        self,
+        sales_data: List[dict],
+        report: ProgressCallback,
+        error_details: List[str]
+    ) -> Tuple[int, int]:
+        """
+        Process raw iiko rows and upsert them; runs in a worker thread
+        
+        A Session must not be shared between threads, so the upserts go
+        through a dedicated session opened and closed here rather than
+        self.db. Returns (summary_count, hourly_count).
+        """
+        # Process sales data
+        report(65, f'Обработка {len(sales_data)} записей...')
+        try:
+            summary_records, hourly_records = self.process_sales_data(sales_data)
+        except Exception as process_error:
+            error_msg = f"Failed to process sales data: {str(process_error)}"
+            logger.error(error_msg)
+            error_details.append(error_msg)
+            raise Exception(error_msg)
+        
+        # Sync to database
+        report(80, 'Сохранение в базу данных...')
+        db = SessionLocal()
+        try:
+            loader = IikoSalesLoaderService(db)
+            summary_count = loader.sync_sales_summary(summary_records)
+            hourly_count = loader.sync_sales_by_hour(hourly_records)
+        except Exception as db_error:
+            db.rollback()
+            error_msg = f"Database sync failed: {str(db_error)}"
+            logger.error(error_msg)
+            error_details.append(error_msg)
+            raise Exception(error_msg)
+        finally:
+            db.close()
+        
+        return summary_count, hourly_count
+    
+    async def sync_sales(
+        self,
+        from_date: date = None,
+        to_date: date = None,
+        department_id: str = None,
+        progress: Optional[ProgressCallback] = None
+    ) -> dict:
         """Main method to sync sales data from iiko
 
         Args:
             from_date: Start date for sync (default: yesterday)
             to_date: End date for sync (default: same as from_date)
             department_id: Optional department ID to filter sync (default: all departments)
+            progress: Optional callback receiving (percent, message) as the sync advances
         """
         error_details = []
+        report = progress or (lambda pct, message: None)
 
         try:
             # Default to current date if no dates provided
@@ -254,8 +320,9 @@ class IikoSalesLoaderService:
             logger.info(f"Starting sales sync from {from_date} to {to_date}, department_id={department_id}")
             
             # Fetch sales data from iiko API
+            report(5, 'Запрос данных из iiko...')
             try:
-                sales_data = await self.fetch_sales_from_iiko(from_date, to_date)
+                sales_data = await self.fetch_sales_from_iiko(from_date, to_date, progress)
             except Exception as fetch_error:
                 error_msg = f"Failed to fetch data from iiko API: {str(fetch_error)}"
                 logger.error(error_msg)
@@ -302,24 +369,15 @@ class IikoSalesLoaderService:
             if sales_data:
                 logger.info(f"First record: {sales_data[0]}")
 
-            # Process sales data
-            try:
-                summary_records, hourly_records = self.process_sales_data(sales_data)
-            except Exception as process_error:
-                error_msg = f"Failed to process sales data: {str(process_error)}"
-                logger.error(error_msg)
-                error_details.append(error_msg)
-                raise Exception(error_msg)
-            
-            # Sync to database
-            try:
-                summary_count = self.sync_sales_summary(summary_records)
-                hourly_count = self.sync_sales_by_hour(hourly_records)
-            except Exception as db_error:
-                error_msg = f"Database sync failed: {str(db_error)}"
-                logger.error(error_msg)
-                error_details.append(error_msg)
-                raise Exception(error_msg)
+            # Process and store in a worker thread with its own session, so
+            # progress frames reach the client and the server stays responsive
+            loop = asyncio.get_running_loop()
+            summary_count, hourly_count = await asyncio.to_thread(
+                self._process_and_store,
+                sales_data,
+                lambda pct, message: loop.call_soon_threadsafe(report, pct, message),
+                error_details
+            )
             
             result = {
                 "status": "success",
@@ -42,6 +42,10 @@ class ModelMonitoringService:
         Returns:
             Dict with daily metrics and any alerts
         """
+        return self.calculate_daily_metrics_sync(target_date)
+    
+    def calculate_daily_metrics_sync(self, target_date: Optional[date] = None) -> Dict[str, Any]:
+        """Blocking body of calculate_daily_metrics, for callers running in a worker thread"""
         db: Session = next(get_db())
         
         try:
@@ -10,10 +10,11 @@ import os
 import json
 import pickle
 import shutil
+import threading
 from datetime import datetime, date, timedelta
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, func, desc
-from typing import Optional, Dict, List, Tuple, Any
+from typing import Optional, Dict, List, Tuple, Any, Callable
 import logging
 import traceback
 import uuid
@@ -27,6 +28,9 @@ from .error_analysis_service import ErrorAnalysisService
 
 logger = logging.getLogger(__name__)
 
+# progress(pct, message) callback used to report retraining stages to the UI
+ProgressCallback = Callable[[int, str], None]
+
 
 class ModelRetrainingService:
     """Service for automatic model retraining with versioning"""
@@ -37,12 +41,20 @@ class ModelRetrainingService:
         self.models_dir.mkdir(exist_ok=True)
         self.archive_dir = self.models_dir / "archive"
         self.archive_dir.mkdir(exist_ok=True)
+        # Held for the whole retrain: runs share model files and the forecaster
+        self._retrain_lock = threading.Lock()
+    
+    @property
+    def retrain_in_progress(self) -> bool:
+        """Whether a retrain is running right now"""
+        return self._retrain_lock.locked()
     
     async def auto_retrain_model(
         self,
         trigger_type: str = 'scheduled',
         trigger_details: Optional[Dict] = None,
-        performance_threshold: float = 10.0  # MAPE threshold for deployment
+        performance_threshold: float = 10.0,  # MAPE threshold for deployment
+        progress: Optional[ProgressCallback] = None
     ) -> Dict[str, Any]:
         """
         Automatically retrain model and decide whether to deploy
@@ -51,18 +63,51 @@ class ModelRetrainingService:
             trigger_type: Type of trigger ('scheduled', 'manual', 'performance_degradation')
             trigger_details: Additional details about the trigger
             performance_threshold: Maximum acceptable MAPE improvement threshold
+            progress: Optional callback receiving (percent, message) as retraining advances
             
         Returns:
-            Dict with retraining results and deployment decision
+            Dict with retraining results and deployment decision; status is
+            'busy' if another retrain is already running
         """
+        return self.retrain_model_sync(trigger_type, trigger_details, performance_threshold, progress)
+    
+    def retrain_model_sync(
+        self,
+        trigger_type: str = 'scheduled',
+        trigger_details: Optional[Dict] = None,
+        performance_threshold: float = 10.0,
+        progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """Blocking body of auto_retrain_model; at most one retrain runs at a time"""
+        if not self._retrain_lock.acquire(blocking=False):
+            self.logger.warning(f"Retraining ({trigger_type}) skipped - another retrain is in progress")
+            return {
+                "status": "busy",
+                "message": "Model retraining is already in progress"
+            }
+        try:
+            return self._retrain_model(trigger_type, trigger_details, performance_threshold, progress)
+        finally:
+            self._retrain_lock.release()
+    
+    def _retrain_model(
+        self,
+        trigger_type: str = 'scheduled',
+        trigger_details: Optional[Dict] = None,
+        performance_threshold: float = 10.0,  # MAPE threshold for deployment
+        progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """Retrain, compare with the current model and deploy or archive; called under _retrain_lock"""
         db: Session = next(get_db())
         retrain_start = datetime.utcnow()
+        report = progress or (lambda pct, message: None)
         
         try:
             self.logger.info(f"Starting automatic model retraining. Trigger: {trigger_type}")
             
             # 1. Get current model performance
-            current_performance = await self._get_current_model_performance(db)
+            report(5, 'Оценка текущей модели...')
+            current_performance = self._get_current_model_performance(db)
             current_version = current_performance.get('version_id', 'unknown')
             current_mape = current_performance.get('recent_mape', float('inf'))
             
@@ -79,6 +124,7 @@ class ModelRetrainingService:
                 }
             
             # 3. Prepare training data
+            report(15, 'Подготовка обучающих данных...')
             training_service = TrainingDataService(db)
             training_data = training_service.prepare_training_data(
                 days=365,  # Use last year of data
@@ -93,6 +139,7 @@ class ModelRetrainingService:
             train_df, val_df, test_df = training_service.split_train_validation_test(training_data)
             
             # 5. Train new model
+            report(35, f'Обучение модели на {len(training_data)} записях...')
             self.logger.info(f"Training new model with {len(training_data)} samples")
             new_forecaster = SalesForecasterAgent()
             model, metrics = new_forecaster.train_model(train_df, val_df, test_df)
@@ -101,6 +148,7 @@ class ModelRetrainingService:
             new_version_id = self._generate_version_id()
             
             # 7. Save new model temporarily
+            report(80, 'Сохранение модели...')
             temp_model_path = self.models_dir / f"temp_{new_version_id}.pkl"
             new_forecaster._save_model(metrics=metrics)
             
@@ -145,6 +193,7 @@ class ModelRetrainingService:
             }
             
             # 10. Decide whether to deploy
+            report(90, 'Сравнение с текущей моделью...')
             new_test_mape = metrics.get('test_mape', float('inf'))
             deployment_decision = self._make_deployment_decision(
                 current_mape, new_test_mape, performance_threshold
@@ -235,7 +284,7 @@ class ModelRetrainingService:
         finally:
             db.close()
     
-    async def _get_current_model_performance(self, db: Session) -> Dict[str, Any]:
+    def _get_current_model_performance(self, db: Session) -> Dict[str, Any]:
         """Get current model performance metrics"""
         # Get recent predictions accuracy (last 7 days)
         seven_days_ago = date.today() - timedelta(days=7)
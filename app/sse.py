@@ -0,0 +1,56 @@
+"""
+Server-Sent Events helpers
+
+Long-running operations push progress to the admin UI over a single
+streaming response instead of being polled.
+"""
+
+import json
+import time
+from typing import Any, Iterable, Iterator, Optional
+
+from fastapi.responses import StreamingResponse
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize numpy scalars, dates and other non-JSON values"""
+    if hasattr(value, 'item'):
+        return value.item()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def sse_event(data: Any, event: Optional[str] = None) -> str:
+    """Format one SSE frame"""
+    payload = json.dumps(data, ensure_ascii=False, default=_json_default)
+    if event:
+        return f"event: {event}\ndata: {payload}\n\n"
+    return f"data: {payload}\n\n"
+
+
+def throttle_events(frames: Iterable[dict], min_interval: float = 0.1) -> Iterator[str]:
+    """
+    Emit progress frames no more often than every min_interval seconds
+
+    Intermediate frames arriving faster are dropped; frames marked with
+    'done' are always sent.
+    """
+    last_sent = 0.0
+    for frame in frames:
+        now = time.monotonic()
+        if frame.get('done') or now - last_sent >= min_interval:
+            last_sent = now
+            yield sse_event(frame)
+
+
+class EventStreamResponse(StreamingResponse):
+    """StreamingResponse preconfigured for text/event-stream"""
+
+    def __init__(self, content, **kwargs):
+        headers = {
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',
+            **(kwargs.pop('headers', None) or {})
+        }
+        super().__init__(content, media_type='text/event-stream', headers=headers, **kwargs)
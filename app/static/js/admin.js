@@ -0,0 +1,1028 @@
+// API_TOKEN is injected into the page by the server (see app/frontend.py)
+const AUTH_HEADERS = {
+    'Authorization': `Bearer ${API_TOKEN}`
+};
+
+// Shared ru-RU formatters: creating an Intl formatter is the expensive part,
+// so table renderers reuse these instead of calling toLocaleString per cell
+const NUMBER_FORMAT = new Intl.NumberFormat('ru-RU', { maximumFractionDigits: 0 });
+const DATE_FORMAT = new Intl.DateTimeFormat('ru-RU');
+const DATETIME_FORMAT = new Intl.DateTimeFormat('ru-RU', {
+    day: '2-digit', month: '2-digit', year: 'numeric',
+    hour: '2-digit', minute: '2-digit', second: '2-digit'
+});
+
+function formatNumber(value) {
+    return NUMBER_FORMAT.format(Math.round(Number(value)));
+}
+
+const ISO_DATE_RE = /^\d{4}-\d{2}-\d{2}$/;
+
+function formatDate(value) {
+    // Plain YYYY-MM-DD dates from the API are rearranged without a Date
+    // round-trip (which would also parse them as UTC midnight)
+    if (typeof value === 'string' && ISO_DATE_RE.test(value)) {
+        const [year, month, day] = value.split('-');
+        return `${day}.${month}.${year}`;
+    }
+    return DATE_FORMAT.format(new Date(value));
+}
+
+function formatDateTime(value) {
+    return DATETIME_FORMAT.format(new Date(value));
+}
+
+function isoDate(date) {
+    return date.toISOString().slice(0, 10);
+}
+
+// Default date ranges of the pages, as { from, to } ISO strings counted from
+// today; computed once per range and day
+const defaultRanges = new Map();
+let defaultRangesDay = '';
+
+function defaultRange(daysBack, daysForward) {
+    const today = new Date();
+    const day = today.toDateString();
+    if (day !== defaultRangesDay) {
+        defaultRanges.clear();
+        defaultRangesDay = day;
+    }
+
+    const key = `${daysBack}|${daysForward}`;
+    let range = defaultRanges.get(key);
+    if (!range) {
+        const from = new Date(today);
+        from.setDate(today.getDate() - daysBack);
+        const to = new Date(today);
+        to.setDate(today.getDate() + daysForward);
+        range = { from: isoDate(from), to: isoDate(to) };
+        defaultRanges.set(key, range);
+    }
+    return range;
+}
+
+// Runs DOM writes in the next animation frame; repeated requests with the
+// same key before that frame collapse into the latest callback
+const pendingFrames = new Map();
+
+function scheduleFrame(key, callback) {
+    const alreadyScheduled = pendingFrames.has(key);
+    pendingFrames.set(key, callback);
+    if (!alreadyScheduled) {
+        requestAnimationFrame(() => {
+            const latest = pendingFrames.get(key);
+            pendingFrames.delete(key);
+            latest();
+        });
+    }
+}
+
+// Delays fn until ms have passed without another call. The returned
+// function also has cancel() (drop the pending call) and flush() (run it now)
+function debounce(fn, ms) {
+    let timer = null;
+    let pending = null;
+    const run = () => {
+        const call = pending;
+        timer = null;
+        pending = null;
+        if (call) fn.apply(call.self, call.args);
+    };
+    const debounced = function(...args) {
+        clearTimeout(timer);
+        pending = { self: this, args };
+        timer = setTimeout(run, ms);
+    };
+    debounced.cancel = () => {
+        clearTimeout(timer);
+        timer = null;
+        pending = null;
+    };
+    debounced.flush = () => {
+        clearTimeout(timer);
+        run();
+    };
+    return debounced;
+}
+
+// One in-flight request per key: starting a new one aborts the previous, so
+// repeated clicks don't stack requests and a stale response can't render
+const activeRequests = new Map();
+
+function startRequest(key) {
+    const previous = activeRequests.get(key);
+    if (previous) previous.abort();
+    const controller = new AbortController();
+    activeRequests.set(key, controller);
+    return controller.signal;
+}
+
+function isAbortError(error) {
+    return error && error.name === 'AbortError';
+}
+
+// Latest JSON GET per key (one per table/page). Repeating the URL that is
+// still in flight shares that request; a different URL aborts it, so a
+// slower stale response can never overwrite a fresher one
+const latestJsonRequests = new Map();
+
+function fetchLatestJson(key, url) {
+    const current = latestJsonRequests.get(key);
+    if (current && current.url === url) {
+        return current.promise;
+    }
+    const signal = startRequest(key);
+    const promise = fetch(url, { headers: AUTH_HEADERS, signal })
+        .then(response => response.json())
+        .finally(() => {
+            if (latestJsonRequests.get(key) === entry) {
+                latestJsonRequests.delete(key);
+            }
+        });
+    const entry = { url, promise };
+    latestJsonRequests.set(key, entry);
+    return promise;
+}
+
+// Parsed JSON of recent GETs with their ETag, least recently used first.
+// Repeating a URL sends If-None-Match; on 304 the cached data is returned
+// without downloading or parsing the body again. With maxAgeMs, an entry
+// younger than that is returned without a request at all
+const JSON_CACHE_SIZE = 16;
+const jsonCache = new Map();
+
+async function cachedFetchJson(url, signal, maxAgeMs = 0) {
+    const cached = jsonCache.get(url);
+    if (cached && performance.now() - cached.fetchedAt < maxAgeMs) {
+        jsonCache.delete(url);
+        jsonCache.set(url, cached);
+        return cached.data;
+    }
+    const headers = cached ? { ...AUTH_HEADERS, 'If-None-Match': cached.etag } : AUTH_HEADERS;
+    const response = await fetch(url, { headers, signal });
+
+    if (response.status === 304 && cached) {
+        cached.fetchedAt = performance.now();
+        jsonCache.delete(url);
+        jsonCache.set(url, cached);
+        return cached.data;
+    }
+
+    const data = await response.json();
+    const etag = response.headers.get('ETag');
+    jsonCache.delete(url);
+    if (response.ok && etag) {
+        jsonCache.set(url, { etag, data, fetchedAt: performance.now() });
+        if (jsonCache.size > JSON_CACHE_SIZE) {
+            jsonCache.delete(jsonCache.keys().next().value);
+        }
+    }
+    return data;
+}
+
+// Reads a text/event-stream fetch response, calling onFrame with each parsed
+// data payload. EventSource can't send the Authorization header, hence fetch.
+async function readEventStream(response, onFrame) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const block = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            const data = block.split('\n')
+                .filter(line => line.startsWith('data:'))
+                .map(line => line.slice(5).trim())
+                .join('\n');
+            if (data) onFrame(JSON.parse(data));
+        }
+    }
+}
+
+const HTML_ESCAPE_RE = /[&<>"]/g;
+const HTML_ESCAPES = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;' };
+
+function escapeHtml(value) {
+    return String(value ?? '').replace(HTML_ESCAPE_RE, c => HTML_ESCAPES[c]);
+}
+
+// Runs a callback when the browser is idle (timeout fallback without
+// requestIdleCallback)
+const scheduleIdle = window.requestIdleCallback
+    ? callback => window.requestIdleCallback(callback)
+    : callback => setTimeout(() => callback({ timeRemaining: () => 8 }), 0);
+
+// Windowed rendering for long tables: only rows around the visible part of the
+// scroll container are in the DOM, spacer rows keep the full scroll height.
+// Lists up to VIRTUAL_MIN_ROWS are rendered in full.
+const VIRTUAL_OVERSCAN = 10;
+const VIRTUAL_MIN_ROWS = 200;
+const VIRTUAL_DEFAULT_ROW_HEIGHT = 45;
+
+function createVirtualTable(tbody, colspan) {
+    const container = tbody.closest('.table-container');
+    container.classList.add('virtual-scroll');
+
+    const table = {
+        container,
+        tbody,
+        colspan,
+        count: 0,
+        renderRow: null,
+        rowHeight: 0,
+        start: -1,
+        end: -1,
+        frame: 0
+    };
+
+    container.addEventListener('scroll', () => {
+        if (!table.frame) {
+            table.frame = requestAnimationFrame(() => {
+                table.frame = 0;
+                renderVirtualWindow(table, false);
+            });
+        }
+    }, { passive: true });
+
+    return table;
+}
+
+function setVirtualRows(table, count, renderRow) {
+    table.count = count;
+    table.renderRow = renderRow;
+
+    if (count <= VIRTUAL_MIN_ROWS) {
+        let html = '';
+        for (let i = 0; i < count; i++) {
+            html += renderRow(i);
+        }
+        table.tbody.innerHTML = html;
+        return;
+    }
+
+    renderVirtualWindow(table, true);
+}
+
+// Called when the tbody is replaced by a placeholder (no data / error)
+function resetVirtualTable(table) {
+    if (table) {
+        table.count = 0;
+        table.renderRow = null;
+    }
+}
+
+function virtualSpacer(table, height) {
+    return height > 0
+        ? `<tr class="virtual-spacer" style="height: ${height}px"><td colspan="${table.colspan}"></td></tr>`
+        : '';
+}
+
+function renderVirtualWindow(table, force) {
+    if (table.count <= VIRTUAL_MIN_ROWS) {
+        return;
+    }
+
+    const rowHeight = table.rowHeight || VIRTUAL_DEFAULT_ROW_HEIGHT;
+    const scrollTop = table.container.scrollTop;
+    const viewHeight = table.container.clientHeight || 600;
+    const start = Math.max(0, Math.floor(scrollTop / rowHeight) - VIRTUAL_OVERSCAN);
+    const end = Math.min(table.count, Math.ceil((scrollTop + viewHeight) / rowHeight) + VIRTUAL_OVERSCAN);
+
+    if (!force && start === table.start && end === table.end) {
+        return;
+    }
+    table.start = start;
+    table.end = end;
+
+    let html = virtualSpacer(table, start * rowHeight);
+    for (let i = start; i < end; i++) {
+        html += table.renderRow(i);
+    }
+    html += virtualSpacer(table, (table.count - end) * rowHeight);
+    table.tbody.innerHTML = html;
+
+    // Measure the real row height once and re-window if the estimate was off
+    if (!table.rowHeight) {
+        const row = table.tbody.querySelector('tr:not(.virtual-spacer)');
+        const measured = row ? row.getBoundingClientRect().height : 0;
+        if (measured > 0) {
+            table.rowHeight = measured;
+            if (Math.abs(measured - rowHeight) > 1) {
+                renderVirtualWindow(table, true);
+            }
+        }
+    }
+}
+
+let allBranches = [];
+let filteredBranches = [];
+
+// The departments page is never lazily mounted and this script runs after the
+// markup, so its hot elements are looked up once
+const departmentsDom = {
+    loading: document.getElementById('loading'),
+    tbody: document.getElementById('branches-tbody'),
+    search: document.getElementById('search-input'),
+    companyFilter: document.getElementById('company-filter'),
+    typeFilter: document.getElementById('type-filter'),
+    totalCount: document.getElementById('total-count'),
+    filterHint: document.getElementById('filter-hint')
+};
+// Built once per departments load (see indexBranches)
+let branchById = new Map();
+let branchSearchText = new Map();
+let branchSeasonText = new Map();
+// Row markup built lazily as rows scroll into view, reused until the next load
+let branchRowCache = new Map();
+let branchesVersion = 0;
+
+const SEGMENT_LABELS = {
+    'restaurant': 'Ресторан',
+    'coffeehouse': 'Кофейня',
+    'confectionery': 'Кондитерская',
+    'food_court': 'Фудкорт в ТРЦ',
+    'store': 'Магазин',
+    'fast_food': 'Фаст-фуд',
+    'bakery': 'Пекарня',
+    'cafe': 'Кафе',
+    'bar': 'Бар'
+};
+
+function seasonText(branch) {
+    if (branch.season_start_date && branch.season_end_date) {
+        return `${formatDate(branch.season_start_date)} - ${formatDate(branch.season_end_date)}`;
+    }
+    if (branch.season_start_date || branch.season_end_date) {
+        return 'Частично задан';
+    }
+    return '-';
+}
+
+function indexBranches() {
+    branchesVersion++;
+    branchById = new Map(allBranches.map(branch => [branch.id, branch]));
+    // Lowercased searchable text, so filtering does one includes() per branch
+    branchSearchText = new Map(allBranches.map(branch => [
+        branch.id,
+        `${branch.name || ''}\n${branch.code || ''}\n${branch.id}`.toLowerCase()
+    ]));
+    // Formatted once here instead of on every table render
+    branchSeasonText = new Map(allBranches.map(branch => [branch.id, seasonText(branch)]));
+    branchRowCache = new Map();
+}
+
+// Display name for a department id, as shown in the sales tables and charts
+function departmentName(departmentId) {
+    const dept = branchById.get(departmentId);
+    return dept ? (dept.name || dept.code) : departmentId;
+}
+
+// Settles once the first departments load has finished; pages that fill
+// department selects wait on it instead of rendering an empty list first
+let firstBranchesLoad = null;
+
+function ensureBranchesLoaded() {
+    if (!firstBranchesLoad) {
+        firstBranchesLoad = loadBranches();
+    }
+    return firstBranchesLoad;
+}
+
+async function loadBranches() {
+    const signal = startRequest('branches');
+    departmentsDom.loading.classList.add('active');
+    try {
+        const selectedType = departmentsDom.typeFilter.value;
+        let apiUrl = '/api/departments/';
+
+        // Always load all types to properly populate filters
+        // We'll filter on the client side for better UX
+        apiUrl = '/api/departments/?show_all_types=true';
+
+        const response = await fetch(apiUrl, { headers: AUTH_HEADERS, signal });
+        const responseData = await response.json();
+
+        // Handle different response formats
+        if (responseData.departments) {
+            allBranches = responseData.departments; // sales-points endpoint
+        } else {
+            allBranches = responseData; // regular departments endpoint
+        }
+        departmentOptions = null;
+        indexBranches();
+
+        // Populate company filter
+        populateCompanyFilter();
+
+        // Apply current filters
+        applyFilters();
+
+        // Update filter hint
+        updateFilterHint();
+
+    } catch (error) {
+        if (isAbortError(error)) return;
+        console.error('Error loading branches:', error);
+        resetVirtualTable(branchesTable);
+        lastBranchesRenderKey = null;
+        departmentsDom.tbody.innerHTML = 
+            '<tr><td colspan="8" class="no-data">Ошибка загрузки данных</td></tr>';
+    } finally {
+        // A newer request owns the indicator if this one was aborted
+        if (!signal.aborted) {
+            departmentsDom.loading.classList.remove('active');
+        }
+    }
+}
+
+function updateFilterHint() {
+    const selectedType = departmentsDom.typeFilter.value;
+    const hintElement = departmentsDom.filterHint;
+
+    const hints = {
+        'DEPARTMENT': 'Показаны только торговые точки с данными о продажах',
+        'JURPERSON': 'Показаны юридические лица (организационные единицы)',
+        'CORPORATION': 'Показаны корпорации (верхний уровень управления)',
+        'ALL': 'Показаны все типы подразделений'
+    };
+
+    hintElement.textContent = hints[selectedType] || '';
+}
+
+// Distinct non-empty names of branches of the given type, sorted; one pass
+function uniqueBranchNames(type) {
+    const names = [];
+    const seen = new Set();
+    for (const branch of allBranches) {
+        if (branch.type === type && branch.name && !seen.has(branch.name)) {
+            seen.add(branch.name);
+            names.push(branch.name);
+        }
+    }
+    return names.sort();
+}
+
+const COMPANY_FILTER_LABELS = {
+    'DEPARTMENT': 'Все торговые точки',
+    'JURPERSON': 'Все юридические лица',
+    'CORPORATION': 'Все корпорации',
+    'ALL': 'Все организации'
+};
+
+function populateCompanyFilter() {
+    const selectedType = departmentsDom.typeFilter.value;
+    const filter = departmentsDom.companyFilter;
+
+    let parents;
+    if (selectedType === 'DEPARTMENT' || selectedType === 'ALL') {
+        // For departments, show parent companies (JURPERSON)
+        parents = uniqueBranchNames('JURPERSON');
+    } else if (selectedType === 'JURPERSON') {
+        // For JURPERSON, show parent corporations
+        parents = uniqueBranchNames('CORPORATION');
+    } else if (selectedType === 'CORPORATION') {
+        // For corporations, no parent filter needed - disable dropdown
+        filter.disabled = true;
+        filter.innerHTML = '<option value="">Нет родительских компаний</option>';
+        return;
+    } else {
+        parents = [];
+    }
+
+    // Label option plus all parents in a single DOM write
+    const label = COMPANY_FILTER_LABELS[selectedType] || 'Все компании';
+    filter.innerHTML = `<option value="">${label}</option>` + parents
+        .map(name => `<option value="${escapeHtml(name)}">${escapeHtml(name)}</option>`)
+        .join('');
+
+    // Re-enable dropdown if it was disabled
+    filter.disabled = false;
+}
+
+let lastBranchesRenderKey = null;
+
+function applyFilters() {
+    const searchTerm = departmentsDom.search.value.toLowerCase();
+    const selectedCompany = departmentsDom.companyFilter.value;
+
+    const selectedType = departmentsDom.typeFilter.value;
+
+    filteredBranches = allBranches.filter(branch => {
+        // First filter by type
+        const matchesType = selectedType === 'ALL' || branch.type === selectedType;
+
+        const matchesSearch = !searchTerm || branchSearchText.get(branch.id).includes(searchTerm);
+
+        // Find parent entity for filtering based on selected type
+        let parentEntity = '';
+        const parent = branch.parent_id ? branchById.get(branch.parent_id) : null;
+
+        if (selectedType === 'DEPARTMENT' || selectedType === 'ALL') {
+            // For departments, filter by parent JURPERSON
+            if (parent && parent.type === 'JURPERSON') {
+                parentEntity = parent.name;
+            }
+        } else if (selectedType === 'JURPERSON') {
+            // For JURPERSON, filter by parent CORPORATION
+            if (parent && parent.type === 'CORPORATION') {
+                parentEntity = parent.name;
+            }
+        }
+        // For CORPORATION type, no parent filtering is needed
+
+        const matchesCompany = !selectedCompany || parentEntity === selectedCompany;
+
+        return matchesType && matchesSearch && matchesCompany;
+    });
+
+    // Skip the re-render when the same data produced the same rows
+    const renderKey = branchesVersion + ':' + filteredBranches.map(branch => branch.id).join(',');
+    if (renderKey === lastBranchesRenderKey) {
+        return;
+    }
+    lastBranchesRenderKey = renderKey;
+
+    scheduleFrame('branches-table', () => {
+        renderTable();
+        updateTotalCount();
+    });
+}
+
+// Segment type with Russian labels
+let branchesTable = null;
+
+// Same markup for every row; the department id lives on the <tr>
+const BRANCH_ACTIONS_HTML =
+    '<td><button class="edit-btn" data-action="edit">Редактировать</button></td>';
+
+function branchRowHtml(branch) {
+    let html = branchRowCache.get(branch.id);
+    if (html === undefined) {
+        html = buildBranchRowHtml(branch);
+        branchRowCache.set(branch.id, html);
+    }
+    return html;
+}
+
+function buildBranchRowHtml(branch) {
+    return `<tr data-id="${escapeHtml(branch.id)}">` +
+        `<td>${escapeHtml(branch.code || '-')}</td>` +
+        `<td>${escapeHtml(branch.name || '-')}</td>` +
+        `<td>${escapeHtml(branch.type || '-')}</td>` +
+        `<td>${escapeHtml(SEGMENT_LABELS[branch.segment_type] || branch.segment_type || '-')}</td>` +
+        `<td>${escapeHtml(branch.taxpayer_id_number || '-')}</td>` +
+        `<td>${branchSeasonText.get(branch.id)}</td>` +
+        BRANCH_ACTIONS_HTML +
+        '</tr>';
+}
+
+function renderTable() {
+    const tbody = departmentsDom.tbody;
+
+    if (filteredBranches.length === 0) {
+        resetVirtualTable(branchesTable);
+        tbody.innerHTML = '<tr><td colspan="7" class="no-data">Нет данных для отображения</td></tr>';
+        return;
+    }
+
+    // Only the visible window of rows is rendered; edit buttons are handled
+    // by the delegated click listener on the tbody
+    branchesTable = branchesTable || createVirtualTable(tbody, 7);
+    branchesTable.container.scrollTop = 0;
+    setVirtualRows(branchesTable, filteredBranches.length, i => branchRowHtml(filteredBranches[i]));
+}
+
+function updateTotalCount() {
+    departmentsDom.totalCount.textContent = `Всего: ${filteredBranches.length}`;
+}
+
+async function syncBranches() {
+    if (!confirm('Это синхронизирует подразделения из внешнего API. Продолжить?')) return;
+
+    departmentsDom.loading.classList.add('active');
+    try {
+        const response = await fetch('/api/branches/sync', { method: 'POST', headers: AUTH_HEADERS });
+        const result = await response.json();
+        alert(result.message);
+        loadBranches();
+    } catch (error) {
+        alert('Ошибка синхронизации: ' + error);
+    } finally {
+        departmentsDom.loading.classList.remove('active');
+    }
+}
+
+// Department Modal Functions
+function showDepartmentForm(departmentId = null) {
+    const modal = document.getElementById('department-modal');
+    const form = document.getElementById('department-form');
+    const title = document.getElementById('modal-title');
+
+    if (departmentId) {
+        title.textContent = 'Редактирование подразделения';
+        const department = branchById.get(departmentId);
+        if (department) {
+            fillDepartmentForm(department);
+        }
+    } else {
+        title.textContent = 'Создание подразделения';
+        form.reset();
+        document.getElementById('department-id').value = '';
+        // Hide ID field for new departments
+        document.getElementById('id-field-row').style.display = 'none';
+    }
+
+    // Show/hide season fields based on segment type
+    toggleSeasonFields();
+    modal.style.display = 'block';
+}
+
+function fillDepartmentForm(department) {
+    document.getElementById('department-id').value = department.id || '';
+    document.getElementById('department-name').value = department.name || '';
+    document.getElementById('department-code').value = department.code || '';
+    document.getElementById('department-type').value = department.type || 'DEPARTMENT';
+    document.getElementById('department-segment').value = department.segment_type || 'restaurant';
+    document.getElementById('department-inn').value = department.taxpayer_id_number || '';
+    document.getElementById('department-code-tco').value = department.code_tco || '';
+    document.getElementById('season-start').value = department.season_start_date || '';
+    document.getElementById('season-end').value = department.season_end_date || '';
+
+    // Fill and show the ID display field for editing existing departments
+    if (department.id) {
+        document.getElementById('department-id-display').value = department.id;
+        document.getElementById('id-field-row').style.display = 'block';
+    } else {
+        document.getElementById('id-field-row').style.display = 'none';
+    }
+}
+
+function closeDepartmentModal() {
+    document.getElementById('department-modal').style.display = 'none';
+}
+
+function toggleSeasonFields() {
+    const segmentSelect = document.getElementById('department-segment');
+    const seasonFields = document.getElementById('season-fields');
+
+    if (segmentSelect.value === 'coffeehouse') {
+        seasonFields.style.display = 'block';
+    } else {
+        seasonFields.style.display = 'none';
+    }
+}
+
+function editDepartment(departmentId) {
+    showDepartmentForm(departmentId);
+}
+
+async function deleteDepartment(departmentId) {
+    const department = branchById.get(departmentId);
+    const departmentName = department ? department.name : 'подразделение';
+
+    if (!confirm(`Удалить ${departmentName}?`)) return;
+
+    try {
+        const response = await fetch(`/api/departments/${departmentId}`, {
+            method: 'DELETE',
+            headers: AUTH_HEADERS
+        });
+
+        if (response.ok) {
+            alert('Подразделение удалено');
+            loadBranches();
+        } else {
+            const error = await response.json();
+            alert('Ошибка удаления: ' + (error.detail || 'Неизвестная ошибка'));
+        }
+    } catch (error) {
+        alert('Ошибка удаления: ' + error.message);
+    }
+}
+
+// Department form submission
+document.getElementById('department-form').addEventListener('submit', async function(e) {
+    e.preventDefault();
+
+    const formData = new FormData(e.target);
+    const departmentData = {};
+
+    // Convert FormData to object
+    for (let [key, value] of formData.entries()) {
+        if (value !== '') {
+            departmentData[key] = value;
+        }
+    }
+
+    // Remove id from data for create operations
+    const departmentId = departmentData.id;
+    delete departmentData.id;
+
+    try {
+        let response;
+        if (departmentId) {
+            // Update existing department
+            response = await fetch(`/api/departments/${departmentId}`, {
+                method: 'PUT',
+                headers: {
+                    ...AUTH_HEADERS,
+                    'Content-Type': 'application/json'
+                },
+                body: JSON.stringify(departmentData)
+            });
+        } else {
+            // Create new department
+            response = await fetch('/api/departments/', {
+                method: 'POST',
+                headers: {
+                    ...AUTH_HEADERS,
+                    'Content-Type': 'application/json'
+                },
+                body: JSON.stringify(departmentData)
+            });
+        }
+
+        if (response.ok) {
+            alert(departmentId ? 'Подразделение обновлено' : 'Подразделение создано');
+            closeDepartmentModal();
+            loadBranches();
+        } else {
+            const error = await response.json();
+            alert('Ошибка сохранения: ' + (error.detail || 'Неизвестная ошибка'));
+        }
+    } catch (error) {
+        alert('Ошибка сохранения: ' + error.message);
+    }
+});
+
+// Close modal when clicking outside
+window.onclick = function(event) {
+    const modal = document.getElementById('department-modal');
+    if (event.target === modal) {
+        closeDepartmentModal();
+    }
+}
+
+// Page Navigation Functions
+function showDepartments() {
+    return showPage('departments', '#подразделения');
+}
+
+async function showDataLoading() {
+    if (!await showPage('data-loading', '#загрузка-данных')) return;
+
+    // Set default dates (last 7 days)
+    const range = defaultRange(7, 0);
+    syncDom.startDate.value = range.from;
+    syncDom.endDate.value = range.to;
+
+    // Departments for sync filter come from the shared option pool
+    ensureBranchesLoaded().then(() => fillDepartmentSelect(syncDom.departmentFilter));
+}
+
+// Sales Pages Navigation Functions
+async function showDailySales() {
+    if (!await showPage('daily-sales', '#продажи-по-дням')) return;
+
+    // Set default dates (last 30 days)
+    const range = defaultRange(30, 0);
+    dailyDom.startDate.value = range.from;
+    dailyDom.endDate.value = range.to;
+
+    // Populate department filter
+    ensureBranchesLoaded().then(populateDepartmentFilters);
+}
+
+async function showHourlySales() {
+    if (!await showPage('hourly-sales', '#продажи-по-часам')) return;
+
+    // Set default dates (last 7 days)
+    const range = defaultRange(7, 0);
+    hourlyDom.startDate.value = range.from;
+    hourlyDom.endDate.value = range.to;
+
+    // Populate department filter (hour filter is filled when the page mounts)
+    ensureBranchesLoaded().then(populateDepartmentFilters);
+}
+
+// Code of every page except departments lives in /static/js/pages/*.js and
+// is loaded with a plain <script> when the page is first opened.
+// Chart.js is loaded only for the pages that have charts
+const CHART_JS_URL = 'https://cdn.jsdelivr.net/npm/chart.js';
+
+function pageScript(name) {
+    return `/static/js/pages/${name}.js?v=${ASSET_VERSION}`;
+}
+
+const PAGE_SCRIPTS = {
+    'data-loading': [pageScript('data-loading')],
+    'daily-sales': [pageScript('sales')],
+    'hourly-sales': [CHART_JS_URL, pageScript('sales')],
+    'forecast-branch': [pageScript('forecast')],
+    'forecast-comparison': [CHART_JS_URL, pageScript('forecast')],
+    'auto-sync': [pageScript('auto-sync')]
+};
+
+const loadedScripts = new Map();
+
+function loadScript(src) {
+    if (!loadedScripts.has(src)) {
+        loadedScripts.set(src, new Promise((resolve, reject) => {
+            const script = document.createElement('script');
+            script.src = src;
+            script.onload = resolve;
+            script.onerror = () => {
+                // Allow a retry on the next navigation
+                loadedScripts.delete(src);
+                reject(new Error(`Не удалось загрузить ${src}`));
+            };
+            document.head.appendChild(script);
+        }));
+    }
+    return loadedScripts.get(src);
+}
+
+// Every page except departments sits in a <template data-page="..."> and is
+// put into the DOM only when first opened. Page element per mounted page name
+const mountedPages = new Map([['departments', document.getElementById('page-departments')]]);
+
+async function mountPage(name) {
+    if (!mountedPages.has(name)) {
+        await Promise.all((PAGE_SCRIPTS[name] || []).map(loadScript));
+        // Another navigation may have mounted it while scripts were loading
+        if (!mountedPages.has(name)) {
+            const template = document.querySelector(`template[data-page="${name}"]`);
+            template.replaceWith(template.content.cloneNode(true));
+            mountedPages.set(name, document.getElementById(`page-${name}`));
+            initPage(name);
+        }
+    }
+    return mountedPages.get(name);
+}
+
+// Page scripts register a function here that runs once, right after the
+// page's markup is mounted (cache element handles, attach listeners)
+const pageInitializers = {};
+
+function initPage(name) {
+    const init = pageInitializers[name];
+    if (init) init();
+}
+
+// Incremented on every navigation, so a page whose scripts finish loading
+// after the user has already moved on is not shown
+let pageNavigation = 0;
+// The page currently on screen; departments is shown at startup
+let currentPage = mountedPages.get('departments');
+
+// Mounts (loading its scripts if needed) and shows a page. Resolves to the
+// page element, or null if a later navigation superseded this one
+async function showPage(name, selector) {
+    const navigation = ++pageNavigation;
+    let page;
+    try {
+        page = await mountPage(name);
+    } catch (error) {
+        console.error('Page load error:', error);
+        alert('Не удалось загрузить страницу. Проверьте подключение и попробуйте снова.');
+        return null;
+    }
+    if (navigation !== pageNavigation) return null;
+
+    // Only the outgoing and incoming pages are touched, by a class flip
+    if (currentPage !== page) {
+        currentPage.classList.remove('active');
+        page.classList.add('active');
+        currentPage = page;
+    }
+    updateSidebarActive(selector);
+    window.scrollTo(0, 0);
+    return page;
+}
+
+// The sidebar is static: its links are indexed by href once
+const sidebarLinks = new Map(
+    Array.from(document.querySelectorAll('.sidebar-menu a'), link => [link.getAttribute('href'), link])
+);
+let activeSidebarLink = document.querySelector('.sidebar-menu a.active');
+
+function updateSidebarActive(selector) {
+    const link = sidebarLinks.get(selector) || null;
+    if (link === activeSidebarLink) return;
+    if (activeSidebarLink) activeSidebarLink.classList.remove('active');
+    if (link) link.classList.add('active');
+    activeSidebarLink = link;
+}
+
+// Options for every department <select> are built once per departments load
+// (sales points only, sorted by name) as a fragment that each select clones
+let departmentOptions = null;
+
+function getDepartmentOptions() {
+    if (departmentOptions === null) {
+        const salesPointDepartments = (allBranches || [])
+            .filter(dept => dept.type === 'DEPARTMENT')
+            .sort((a, b) => (a.name || '').localeCompare(b.name || ''));
+
+        departmentOptions = document.createDocumentFragment();
+        departmentOptions.appendChild(new Option('Все подразделения', ''));
+        for (const dept of salesPointDepartments) {
+            departmentOptions.appendChild(new Option(dept.name || dept.code || dept.id, dept.id));
+        }
+    }
+    return departmentOptions;
+}
+
+function fillDepartmentSelect(select) {
+    // Selects already filled from the current departments load are left
+    // alone (this also keeps the user's selection across page switches)
+    if (select && select.dataset.branchesVersion !== String(branchesVersion)) {
+        select.replaceChildren(getDepartmentOptions().cloneNode(true));
+        select.dataset.branchesVersion = branchesVersion;
+    }
+}
+
+function populateDepartmentFilters() {
+    fillDepartmentSelect(dailyDom.departmentFilter);
+    fillDepartmentSelect(hourlyDom.departmentFilter);
+}
+
+function populateForecastDepartmentFilters() {
+    fillDepartmentSelect(document.getElementById('forecast-department-filter'));
+    fillDepartmentSelect(document.getElementById('comparison-department-filter'));
+}
+
+// Event listeners
+// Typing is debounced; Enter applies right away. The company select is rare
+// and applies immediately, which also covers any search still pending
+const applySearchDebounced = debounce(applyFilters, 150);
+departmentsDom.search.addEventListener('input', applySearchDebounced);
+departmentsDom.search.addEventListener('keydown', function(event) {
+    if (event.key === 'Enter') {
+        applySearchDebounced.flush();
+    }
+});
+departmentsDom.companyFilter.addEventListener('change', function() {
+    applySearchDebounced.cancel();
+    applyFilters();
+});
+const BRANCH_ACTIONS = {
+    edit: editDepartment,
+    delete: deleteDepartment
+};
+
+departmentsDom.tbody.addEventListener('click', function(event) {
+    const button = event.target.closest('button[data-action]');
+    const row = button && button.closest('tr[data-id]');
+    const action = button && BRANCH_ACTIONS[button.dataset.action];
+    if (row && action) {
+        action(row.dataset.id);
+    }
+});
+
+// Forecast Pages Navigation Functions
+async function showForecastByBranch() {
+    if (!await showPage('forecast-branch', '#прогноз-по-филиалам')) return;
+
+    // Set default dates (next 7 days)
+    const range = defaultRange(0, 7);
+    document.getElementById('forecast-start-date').value = range.from;
+    document.getElementById('forecast-end-date').value = range.to;
+
+    // Populate department filter
+    ensureBranchesLoaded().then(populateForecastDepartmentFilters);
+}
+
+async function showForecastComparison() {
+    if (!await showPage('forecast-comparison', '#сравнение-факт-прогноз')) return;
+
+    // Set default dates (last 30 days with actual data)
+    // Use yesterday as end date since today might not have actual sales data yet
+    const range = defaultRange(31, -1);
+    document.getElementById('comparison-start-date').value = range.from;
+    document.getElementById('comparison-end-date').value = range.to;
+
+    // Populate department filter
+    ensureBranchesLoaded().then(populateForecastDepartmentFilters);
+}
+
+// Auto Sync Page Navigation
+async function showAutoSyncStatus() {
+    if (!await showPage('auto-sync', '#авто-загрузка')) return;
+
+    // Load auto sync status on page show
+    loadAutoSyncStatus();
+}
+
+// Load data on page load
+window.onload = function() {
+    // Show departments page by default
+    showDepartments();
+    // Load departments data
+    ensureBranchesLoaded();
+};
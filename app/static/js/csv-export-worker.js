@@ -0,0 +1,21 @@
+// Downloads a CSV export off the main thread and hands the finished Blob
+// back to the page, so large exports never block rendering or input.
+self.onmessage = async function(event) {
+    const { url, headers } = event.data;
+
+    try {
+        const response = await fetch(url, { headers });
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}`);
+        }
+
+        const disposition = response.headers.get('Content-Disposition') || '';
+        const match = disposition.match(/filename="?([^";]+)"?/);
+
+        // The body is collected straight into a Blob, without an intermediate string
+        const blob = await response.blob();
+        self.postMessage({ blob, filename: match ? match[1] : 'forecast.csv' });
+    } catch (error) {
+        self.postMessage({ error: error.message });
+    }
+};
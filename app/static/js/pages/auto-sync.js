@@ -0,0 +1,174 @@
+// "Автоматическая загрузка" page, loaded by admin.js (PAGE_SCRIPTS) when first opened
+
+// =============================================================
+// AUTO SYNC FUNCTIONS
+// =============================================================
+
+// Elements of the page, looked up once when it is mounted
+const autoSyncDom = {};
+
+pageInitializers['auto-sync'] = function() {
+    autoSyncDom.successCount = document.getElementById('success-count');
+    autoSyncDom.errorCount = document.getElementById('error-count');
+    autoSyncDom.successRate = document.getElementById('success-rate');
+    autoSyncDom.latestSyncInfo = document.getElementById('latest-sync-info');
+    autoSyncDom.tbody = document.getElementById('auto-sync-tbody');
+};
+
+const AUTO_SYNC_STATUS_URL = '/api/sales/auto-sync/status';
+// Reopening the page within this time reuses the last status without a request
+const AUTO_SYNC_STATUS_MAX_AGE = 30000;
+
+// The refresh button passes 0 to always ask the server
+async function loadAutoSyncStatus(maxAgeMs = AUTO_SYNC_STATUS_MAX_AGE) {
+    const signal = startRequest('auto-sync-status');
+    try {
+        const data = await cachedFetchJson(AUTO_SYNC_STATUS_URL, signal, maxAgeMs);
+
+        // Update statistics
+        autoSyncDom.successCount.textContent = data.statistics.success_count_30d;
+        autoSyncDom.errorCount.textContent = data.statistics.error_count_30d;
+        autoSyncDom.successRate.textContent = data.statistics.success_rate_30d;
+
+        // Update latest sync info
+        updateLatestSyncInfo(data.statistics);
+
+        // Render logs table
+        renderAutoSyncTable(data.logs);
+
+    } catch (error) {
+        if (isAbortError(error)) return;
+        console.error('Error loading auto sync status:', error);
+        autoSyncDom.latestSyncInfo.innerHTML = 
+            '<p class="text-error">Ошибка загрузки данных</p>';
+    }
+}
+
+function updateLatestSyncInfo(statistics) {
+    let html;
+
+    if (statistics.latest_success) {
+        const successInfo = statistics.latest_success;
+        html = `
+            <div class="sync-info-box result-success">
+                <h4>✅ Последняя успешная загрузка</h4>
+                <p><strong>Дата данных:</strong> ${formatDate(successInfo.date)}</p>
+                <p><strong>Время выполнения:</strong> ${formatDateTime(successInfo.executed_at)}</p>
+                <p><strong>Загружено записей:</strong> ${formatNumber(successInfo.records)}</p>
+                <p><strong>Сообщение:</strong> ${successInfo.message}</p>
+            </div>
+        `;
+    } else {
+        html = `
+            <div class="sync-info-box result-error">
+                <p>🚫 Успешных автоматических загрузок пока не было</p>
+            </div>
+        `;
+    }
+
+    if (statistics.latest_error) {
+        const errorInfo = statistics.latest_error;
+        html += `
+            <div class="sync-info-box result-warning">
+                <h4>⚠️ Последняя ошибка</h4>
+                <p><strong>Дата данных:</strong> ${formatDate(errorInfo.date)}</p>
+                <p><strong>Время выполнения:</strong> ${formatDateTime(errorInfo.executed_at)}</p>
+                <p><strong>Ошибка:</strong> ${errorInfo.message}</p>
+                ${errorInfo.error_details ? `<p><strong>Детали:</strong> ${errorInfo.error_details}</p>` : ''}
+            </div>
+        `;
+    }
+
+    // One parse of the whole block instead of re-parsing it for +=
+    autoSyncDom.latestSyncInfo.innerHTML = html;
+}
+
+// Log row, cloned per entry and filled through textContent
+const AUTO_SYNC_ROW = document.createElement('template');
+AUTO_SYNC_ROW.innerHTML =
+    '<tr><td></td><td></td><td></td><td><span></span></td><td></td><td class="cell-truncate"></td></tr>';
+
+function renderAutoSyncTable(logs) {
+    const tbody = autoSyncDom.tbody;
+
+    if (logs.length === 0) {
+        tbody.innerHTML = '<tr><td colspan="6" class="no-data">Логов автоматических загрузок пока нет</td></tr>';
+        return;
+    }
+
+    // Rows are built off-document and inserted with one replaceChildren
+    const fragment = document.createDocumentFragment();
+    logs.forEach(log => {
+        const row = AUTO_SYNC_ROW.content.firstChild.cloneNode(true);
+        const [executedCell, dateCell, typeCell, statusCell, recordsCell, messageCell] = row.cells;
+
+        // Executed At
+        executedCell.textContent = formatDateTime(log.executed_at);
+
+        // Sync Date (data period)
+        dateCell.textContent = formatDate(log.sync_date);
+
+        // Sync Type
+        typeCell.textContent = log.sync_type === 'daily_auto' ? 'Автоматически' : 'Вручную';
+
+        // Status
+        const status = statusCell.firstChild;
+        if (log.status === 'success') {
+            status.className = 'status-healthy';
+            status.textContent = '✅ Успешно';
+        } else {
+            status.className = 'status-error';
+            status.textContent = '❌ Ошибка';
+        }
+
+        // Records count
+        const totalRecords = (log.summary_records || 0) + (log.hourly_records || 0);
+        recordsCell.textContent = formatNumber(totalRecords);
+
+        // Message
+        messageCell.textContent = log.message || '-';
+
+        if (log.error_details) {
+            messageCell.title = log.error_details; // Show full error on hover
+        }
+
+        fragment.appendChild(row);
+    });
+    tbody.replaceChildren(fragment);
+}
+
+async function testAutoSync() {
+    if (!confirm('Это запустит тестовую автоматическую загрузку продаж. Продолжить?')) return;
+
+    try {
+        const button = event.target;
+        button.disabled = true;
+        button.textContent = '⏳ Выполняется...';
+
+        const response = await fetch('/api/sales/auto-sync/test', { method: 'POST', headers: AUTH_HEADERS });
+        const result = await response.json();
+
+        if (result.result && result.result.status === 'success') {
+            alert(`✅ Тестовая загрузка выполнена успешно!
+
+Загружено записей: ${result.result.total_raw_records || 0}
+Дневных сводок: ${result.result.summary_records || 0}
+Почасовых записей: ${result.result.hourly_records || 0}`);
+        } else {
+            alert(`⚠️ Тестовая загрузка завершилась с ошибкой:
+
+${result.result?.message || result.message || 'Неизвестная ошибка'}`);
+        }
+
+        // Reload status; the test run added a log entry
+        loadAutoSyncStatus(0);
+
+    } catch (error) {
+        console.error('Error testing auto sync:', error);
+        alert('❌ Ошибка при выполнении тестовой загрузки: ' + error.message);
+    } finally {
+        const button = event.target;
+        button.disabled = false;
+        button.textContent = '🧪 Тестовый запуск';
+    }
+}
@@ -0,0 +1,171 @@
+// "Загрузка данных" page, loaded by admin.js (PAGE_SCRIPTS) when first opened
+
+// Elements of this page, looked up once when it is mounted
+const syncDom = {};
+
+pageInitializers['data-loading'] = function() {
+    syncDom.form = document.getElementById('sales-sync-form');
+    syncDom.startDate = document.getElementById('start-date');
+    syncDom.endDate = document.getElementById('end-date');
+    syncDom.departmentFilter = document.getElementById('sync-department-filter');
+    syncDom.loadBtn = document.getElementById('load-btn');
+    syncDom.progressSection = document.getElementById('progress-section');
+    syncDom.progressFill = document.getElementById('progress-fill');
+    syncDom.progressText = document.getElementById('progress-text');
+    syncDom.resultSection = document.getElementById('result-section');
+    syncDom.resultContent = document.getElementById('result-content');
+    syncDom.form.addEventListener('submit', handleSalesSync);
+};
+
+// Sales Sync Functions
+async function handleSalesSync(event) {
+    event.preventDefault();
+
+    const startDate = syncDom.startDate.value;
+    const endDate = syncDom.endDate.value;
+    const departmentId = syncDom.departmentFilter.value;
+
+    if (!startDate || !endDate) {
+        alert('Пожалуйста, укажите даты начала и окончания');
+        return;
+    }
+
+    if (new Date(startDate) > new Date(endDate)) {
+        alert('Дата начала не может быть больше даты окончания');
+        return;
+    }
+
+    // Show progress
+    showProgress();
+
+    try {
+        // Build URL with optional department_id parameter
+        let syncUrl = `/api/sales/sync/stream?from_date=${startDate}&to_date=${endDate}`;
+        if (departmentId) {
+            syncUrl += `&department_id=${departmentId}`;
+        }
+
+        const response = await fetch(syncUrl, {
+            method: 'POST',
+            headers: AUTH_HEADERS
+        });
+
+        if (!response.ok) {
+            // HTTP error
+            const errorBody = await response.json().catch(() => ({}));
+            throw new Error(errorBody.detail || errorBody.message || 'HTTP ошибка сервера');
+        }
+
+        // Progress comes from the server as the sync advances
+        let result = null;
+        await readEventStream(response, frame => {
+            if (frame.done) {
+                result = frame;
+            } else {
+                updateProgress(frame.pct, frame.msg);
+            }
+        });
+
+        if (!result) {
+            throw new Error('Соединение прервано до завершения загрузки');
+        }
+
+        // Check if the result indicates success or error
+        if (result.status === 'error') {
+            updateProgress(100, 'Ошибка при загрузке данных');
+            showResult(false, result);
+        } else {
+            updateProgress(100, 'Загрузка завершена успешно!');
+            showResult(true, result);
+        }
+
+    } catch (error) {
+        console.error('Sync error:', error);
+        updateProgress(100, 'Произошла ошибка');
+
+        // Create error object with details
+        const errorData = {
+            message: error.message || 'Неизвестная ошибка сети',
+            details: `Ошибка подключения к серверу. ${error.name ? `Тип: ${error.name}` : ''} Проверьте подключение к интернету и повторите попытку.`,
+            error_type: error.name || 'NetworkError',
+            total_raw_records: 0,
+            summary_records: 0,
+            hourly_records: 0,
+            from_date: startDate,
+            to_date: endDate
+        };
+
+        showResult(false, errorData);
+    } finally {
+        // Re-enable form
+        syncDom.loadBtn.disabled = false;
+        syncDom.loadBtn.textContent = 'Загрузить';
+    }
+}
+
+function showProgress() {
+    syncDom.progressSection.style.display = 'block';
+    syncDom.resultSection.style.display = 'none';
+    syncDom.loadBtn.disabled = true;
+    syncDom.loadBtn.textContent = 'Загружается...';
+    updateProgress(0, 'Подготовка к загрузке...');
+}
+
+function updateProgress(percentage, message) {
+    // Bar and text change together in one frame; intermediate updates are dropped
+    scheduleFrame('sync-progress', () => {
+        syncDom.progressFill.style.transform = `scaleX(${percentage / 100})`;
+        syncDom.progressText.textContent = message;
+    });
+}
+
+// Class currently on the result section, so repeated results skip the write
+let lastResultClass = '';
+
+function showResult(success, data) {
+    const { resultSection, resultContent } = syncDom;
+
+    resultSection.style.display = 'block';
+    const resultClass = 'result-section ' + (success ? 'result-success' : 'result-error');
+    if (resultClass !== lastResultClass) {
+        resultSection.className = resultClass;
+        lastResultClass = resultClass;
+    }
+
+    let html;
+    if (success) {
+        html = `
+            <h3>✅ Синхронизация успешно завершена</h3>
+            <p><strong>Сообщение:</strong> ${data.message}</p>
+            <p><strong>Период:</strong> ${data.from_date} - ${data.to_date}</p>
+            <p><strong>Обработано записей:</strong> ${data.total_raw_records}</p>
+            <p><strong>Дневных сводок:</strong> ${data.summary_records}</p>
+            <p><strong>Почасовых записей:</strong> ${data.hourly_records}</p>
+            ${data.details ? `<p><strong>Детали:</strong> ${data.details}</p>` : ''}
+        `;
+    } else {
+        html = `
+            <h3>❌ Ошибка синхронизации</h3>
+            <p><strong>Основная ошибка:</strong> ${data.message || 'Неизвестная ошибка'}</p>
+            ${data.details ? `<p><strong>Подробности:</strong> ${data.details}</p>` : ''}
+            ${data.error_type ? `<p><strong>Тип ошибки:</strong> ${data.error_type}</p>` : ''}
+            ${data.from_date && data.to_date ? `<p><strong>Период:</strong> ${data.from_date} - ${data.to_date}</p>` : ''}
+            <p><strong>Статистика:</strong></p>
+            <ul style="margin-left: 20px;">
+                <li>Обработано записей: ${data.total_raw_records || 0}</li>
+                <li>Дневных сводок: ${data.summary_records || 0}</li>
+                <li>Почасовых записей: ${data.hourly_records || 0}</li>
+            </ul>
+            <p style="margin-top: 15px;"><strong>Рекомендации:</strong></p>
+            <ul style="margin-left: 20px;">
+                <li>Проверьте подключение к интернету</li>
+                <li>Убедитесь что указанные даты корректны</li>
+                <li>Попробуйте уменьшить диапазон дат</li>
+                <li>Если ошибка повторяется, обратитесь к администратору</li>
+            </ul>
+        `;
+    }
+
+    resultContent.replaceChildren();
+    resultContent.insertAdjacentHTML('afterbegin', html);
+}
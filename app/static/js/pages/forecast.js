@@ -0,0 +1,900 @@
+// Страницы прогноза и сравнения факт / прогноз: подключаются из admin.js (PAGE_SCRIPTS) при первом открытии
+
+// =============================================================
+// FORECAST FUNCTIONS v2.1 - LOGARITHMIC SCALE EDITION
+// Updated: 2025-06-24 | Auto Log/Linear Scale Detection
+// =============================================================
+// Данные сравнения приходят колонками (format=columns): { date: [...], predicted_sales: [...], ... }
+let comparisonData = null;
+let comparisonCount = 0;
+// Числовые ключи сортировки (см. buildComparisonSortKeys) и текущий порядок строк
+let comparisonSortKeys = null;
+let comparisonOrder = new Int32Array(0);
+let sortColumn = 'date';
+let sortDirection = 'asc';
+let forecastChart = null;
+
+// Элементы графика сравнения, ищутся один раз при монтировании страницы
+const comparisonChartDom = {};
+
+pageInitializers['forecast-comparison'] = function() {
+    comparisonChartDom.wrapper = document.getElementById('forecast-chart-wrapper');
+    comparisonChartDom.departmentFilter = document.getElementById('comparison-department-filter');
+    comparisonChartDom.warning = document.getElementById('chart-warning');
+    comparisonChartDom.outliers = document.getElementById('chart-outliers-warning');
+    comparisonChartDom.noData = document.getElementById('chart-no-data');
+    comparisonChartDom.canvas = document.getElementById('forecastChart');
+};
+
+// Прогноз считается на сервере построчно, поэтому длинный период загружаем
+// страницами и показываем каждую сразу по приходу
+const FORECAST_PAGE_SIZE = 500;
+
+async function loadForecasts() {
+    const startDate = document.getElementById('forecast-start-date').value;
+    const endDate = document.getElementById('forecast-end-date').value;
+    const departmentId = document.getElementById('forecast-department-filter').value;
+
+    if (!startDate || !endDate) {
+        alert('Пожалуйста, укажите даты начала и окончания');
+        return;
+    }
+
+    const tbody = document.getElementById('forecast-tbody');
+    const totalCount = document.getElementById('forecast-total-count');
+    const signal = startRequest('forecasts');
+    document.getElementById('forecast-loading').classList.add('active');
+
+    try {
+        let url = `/api/forecast/batch?from_date=${startDate}&to_date=${endDate}&limit=${FORECAST_PAGE_SIZE}`;
+        if (departmentId) {
+            url += `&department_id=${departmentId}`;
+        }
+
+        forecastRows = [];
+        while (true) {
+            // Страницы не кладём в общий кэш JSON: их много, и они вытеснили бы остальные записи
+            const response = await fetch(`${url}&skip=${forecastRows.length}`, { headers: AUTH_HEADERS, signal });
+            const page = await response.json();
+
+            const firstPage = forecastRows.length === 0;
+            forecastRows.push(...page);
+            renderForecastTable(firstPage);
+            totalCount.textContent = `Всего: ${forecastRows.length}`;
+
+            if (page.length < FORECAST_PAGE_SIZE) {
+                break;
+            }
+            // Даём браузеру отрисовать страницу перед запросом следующей
+            await new Promise(resolve => scheduleIdle(resolve));
+            if (signal.aborted) {
+                return;
+            }
+        }
+
+    } catch (error) {
+        if (isAbortError(error)) return;
+        console.error('Error loading forecasts:', error);
+        resetVirtualTable(forecastTable);
+        tbody.innerHTML = 
+            '<tr><td colspan="3" class="no-data">Ошибка загрузки данных</td></tr>';
+    } finally {
+        // A newer load owns the indicator if this one was superseded
+        if (!signal.aborted) {
+            document.getElementById('forecast-loading').classList.remove('active');
+        }
+    }
+}
+
+// CSV export is fetched and assembled in a worker (csv-export-worker.js)
+// so the page stays responsive while a large file downloads
+function exportForecastCsv() {
+    const startDate = document.getElementById('forecast-start-date').value;
+    const endDate = document.getElementById('forecast-end-date').value;
+    const departmentId = document.getElementById('forecast-department-filter').value;
+
+    if (!startDate || !endDate) {
+        alert('Пожалуйста, укажите даты начала и окончания');
+        return;
+    }
+
+    let url = `/api/forecast/export/csv?from_date=${startDate}&to_date=${endDate}`;
+    if (departmentId) {
+        url += `&department_id=${departmentId}`;
+    }
+
+    const button = document.getElementById('forecast-export-btn');
+    button.disabled = true;
+    button.textContent = 'Экспорт...';
+
+    const worker = new Worker('/static/js/csv-export-worker.js');
+    worker.onmessage = function(event) {
+        const { blob, filename, error } = event.data;
+        worker.terminate();
+        button.disabled = false;
+        button.textContent = 'Экспорт в CSV';
+
+        if (error) {
+            alert('Ошибка экспорта: ' + error);
+            return;
+        }
+
+        const link = document.createElement('a');
+        link.href = URL.createObjectURL(blob);
+        link.download = filename;
+        link.click();
+        setTimeout(() => URL.revokeObjectURL(link.href), 0);
+    };
+    worker.postMessage({ url: new URL(url, window.location.origin).href, headers: AUTH_HEADERS });
+}
+
+// Загруженные строки прогноза и таблица, которая показывает только видимые из них
+let forecastRows = [];
+let forecastTable = null;
+
+function forecastRowHtml(forecast) {
+    const salesCell = forecast.predicted_sales !== null
+        ? `<td>₸ ${formatNumber(forecast.predicted_sales)}</td>`
+        : '<td class="text-muted">Недостаточно данных</td>';
+
+    return '<tr>' +
+        `<td>${formatDate(forecast.date)}</td>` +
+        `<td>${escapeHtml(forecast.department_name)}</td>` +
+        salesCell +
+        '</tr>';
+}
+
+function renderForecastTable(resetScroll) {
+    const tbody = document.getElementById('forecast-tbody');
+
+    if (forecastRows.length === 0) {
+        resetVirtualTable(forecastTable);
+        tbody.innerHTML = '<tr><td colspan="3" class="no-data">Нет данных для отображения</td></tr>';
+        return;
+    }
+
+    // Only the rows around the visible part of the table are in the DOM
+    forecastTable = forecastTable || createVirtualTable(tbody, 3);
+    if (resetScroll) {
+        forecastTable.container.scrollTop = 0;
+    }
+    setVirtualRows(forecastTable, forecastRows.length, i => forecastRowHtml(forecastRows[i]));
+}
+
+async function loadComparison() {
+    const startDate = document.getElementById('comparison-start-date').value;
+    const endDate = document.getElementById('comparison-end-date').value;
+    const departmentId = document.getElementById('comparison-department-filter').value;
+
+    if (!startDate || !endDate) {
+        alert('Пожалуйста, укажите даты начала и окончания');
+        return;
+    }
+
+    document.getElementById('comparison-loading').classList.add('active');
+
+    try {
+        let url = `/api/forecast/comparison?from_date=${startDate}&to_date=${endDate}&format=columns`;
+        if (departmentId) {
+            url += `&department_id=${departmentId}`;
+        }
+
+        comparisonData = await cachedFetchJson(url);
+        comparisonCount = comparisonData.date.length;
+        comparisonSortKeys = buildComparisonSortKeys(comparisonData, comparisonCount);
+        comparisonOrder = comparisonSortKeys.order;
+
+        renderComparisonTable(true);
+        updateForecastChart();
+        calculateAndDisplayAverageError();
+        document.getElementById('comparison-total-count').textContent = `Всего: ${comparisonCount}`;
+
+    } catch (error) {
+        console.error('Error loading comparison:', error);
+        resetVirtualTable(comparisonTable);
+        document.getElementById('comparison-tbody').innerHTML = 
+            '<tr><td colspan="6" class="no-data">Ошибка загрузки данных</td></tr>';
+        // Скрываем блок средней ошибки при ошибке
+        document.getElementById('average-error-display').style.display = 'none';
+    } finally {
+        document.getElementById('comparison-loading').classList.remove('active');
+    }
+}
+
+// Переводит колонки ответа сравнения в типизированные массивы ключей сортировки:
+// сортировка идёт по массиву индексов, сами данные не переставляются.
+// Пустые значения хранятся как NaN и при сортировке уходят в конец.
+function buildComparisonSortKeys(data, n) {
+    const toNumber = value => (value === null || value === undefined) ? NaN : value;
+
+    // Названия филиалов заменяем их рангом, чтобы компаратор сравнивал числа
+    const departmentNames = [...new Set(data.department_name.map(name => name || ''))].sort();
+    const departmentRank = new Map(departmentNames.map((name, i) => [name, i]));
+
+    const keys = {
+        date: new Float64Array(n),
+        department: new Int32Array(n),
+        predicted: new Float64Array(n),
+        actual: new Float64Array(n),
+        error: new Float64Array(n),
+        error_pct: new Float64Array(n),
+        departmentNames: departmentNames,
+        order: new Int32Array(n)
+    };
+
+    for (let i = 0; i < n; i++) {
+        keys.date[i] = Date.parse(data.date[i]);
+        keys.department[i] = departmentRank.get(data.department_name[i] || '');
+        keys.predicted[i] = toNumber(data.predicted_sales[i]);
+        keys.actual[i] = toNumber(data.actual_sales[i]);
+        keys.error[i] = toNumber(data.error[i]);
+        keys.error_pct[i] = toNumber(data.error_percentage[i]);
+        keys.order[i] = i;
+    }
+
+    return keys;
+}
+
+function formatComparisonAmount(value) {
+    return value === null || value === undefined ? '—' : '₸ ' + formatNumber(value);
+}
+
+let comparisonTable = null;
+
+function renderComparisonTable(resetScroll) {
+    const tbody = document.getElementById('comparison-tbody');
+
+    if (comparisonCount === 0) {
+        resetVirtualTable(comparisonTable);
+        tbody.innerHTML = '<tr><td colspan="6" class="no-data">Нет данных для отображения</td></tr>';
+        // Скрываем блок средней ошибки если нет данных
+        document.getElementById('average-error-display').style.display = 'none';
+        return;
+    }
+
+    // Only the rows around the visible part of the table are in the DOM;
+    // a new sort order re-renders the current window
+    comparisonTable = comparisonTable || createVirtualTable(tbody, 6);
+    if (resetScroll) {
+        comparisonTable.container.scrollTop = 0;
+    }
+    setVirtualRows(comparisonTable, comparisonOrder.length, k => {
+        const i = comparisonOrder[k];
+        const error = comparisonData.error[i];
+        const errorPct = comparisonData.error_percentage[i];
+
+        let errorCell = '<td>—</td>';
+        if (error !== null && error !== undefined) {
+            errorCell = error >= 0
+                ? `<td class="text-success">+${formatNumber(error)}</td>`
+                : `<td class="text-error">${formatNumber(error)}</td>`;
+        }
+
+        let errorPctCell = '<td>—</td>';
+        if (errorPct !== null && errorPct !== undefined) {
+            errorPctCell = errorPct > 20
+                ? `<td class="error-high">${errorPct.toFixed(1)}%</td>`
+                : `<td>${errorPct.toFixed(1)}%</td>`;
+        }
+
+        return '<tr>' +
+            `<td>${formatDate(comparisonData.date[i])}</td>` +
+            `<td>${escapeHtml(comparisonData.department_name[i])}</td>` +
+            `<td>${formatComparisonAmount(comparisonData.predicted_sales[i])}</td>` +
+            `<td>${formatComparisonAmount(comparisonData.actual_sales[i])}</td>` +
+            errorCell +
+            errorPctCell +
+            '</tr>';
+    });
+}
+
+function sortComparison(column) {
+    if (!comparisonSortKeys || !(column in comparisonSortKeys)) {
+        return;
+    }
+
+    if (sortColumn === column) {
+        sortDirection = sortDirection === 'asc' ? 'desc' : 'asc';
+    } else {
+        sortColumn = column;
+        sortDirection = 'asc';
+    }
+
+    // Быстрые повторные клики по заголовкам схлопываются в одну сортировку
+    // и одну перерисовку в ближайшем кадре, по последнему состоянию
+    scheduleFrame('comparison-sort', applyComparisonSort);
+}
+
+function applyComparisonSort() {
+    if (!comparisonSortKeys) {
+        return;
+    }
+    const values = comparisonSortKeys[sortColumn];
+    const direction = sortDirection === 'asc' ? 1 : -1;
+
+    // Сортируем только индексы; NaN (нет значения) всегда в конце
+    comparisonOrder.sort((a, b) => {
+        const aVal = values[a];
+        const bVal = values[b];
+        const aMissing = aVal !== aVal;
+        const bMissing = bVal !== bVal;
+        if (aMissing || bMissing) {
+            return aMissing === bMissing ? a - b : (aMissing ? 1 : -1);
+        }
+        return (aVal - bVal) * direction || a - b;
+    });
+
+    // График и средняя ошибка не зависят от порядка строк — перерисовываем только таблицу
+    renderComparisonTable();
+}
+
+// =============================================================
+// AVERAGE ERROR CALCULATION FUNCTION
+// Calculates and displays average error percentage
+// =============================================================
+function calculateAndDisplayAverageError() {
+    const avgErrorDisplay = document.getElementById('average-error-display');
+    const avgErrorText = document.getElementById('average-error-text');
+
+    if (comparisonCount === 0) {
+        avgErrorDisplay.style.display = 'none';
+        return;
+    }
+
+    // Один проход по числовым ключам сортировки (пустые значения там NaN);
+    // сумма модулей по Кэхэну, чтобы длинный период не копил ошибку округления
+    const errorPercentages = comparisonSortKeys.error_pct;
+    let sum = 0;
+    let compensation = 0;
+    let validCount = 0;
+    for (let i = 0; i < errorPercentages.length; i++) {
+        const value = errorPercentages[i];
+        if (!isFinite(value)) {
+            continue;
+        }
+        const term = Math.abs(value) - compensation;
+        const total = sum + term;
+        compensation = (total - sum) - term;
+        sum = total;
+        validCount++;
+    }
+
+    if (validCount === 0) {
+        avgErrorText.textContent = 'Нет данных для расчёта средней ошибки';
+        avgErrorDisplay.style.display = 'block';
+        return;
+    }
+
+    // Вычисляем среднее значение
+    const averageError = sum / validCount;
+
+    // Форматируем результат
+    const formattedAverage = averageError.toFixed(1);
+    avgErrorText.textContent = `Средний % ошибки за выбранный период: ${formattedAverage}%`;
+
+    // Показываем блок
+    avgErrorDisplay.style.display = 'block';
+}
+
+// =============================================================
+// LOGARITHMIC SCALE CHART FUNCTION v2.1
+// Auto-detects data outliers and switches between linear/log scale
+// Trigger: ratio > 5x = logarithmic scale + warning
+// =============================================================
+// Видимость блоков графика: показанные в последний раз значения, чтобы
+// писать в style только изменившиеся
+const chartVisibility = {};
+
+function applyChartVisibility(visibility) {
+    for (const key in visibility) {
+        if (chartVisibility[key] !== visibility[key]) {
+            chartVisibility[key] = visibility[key];
+            comparisonChartDom[key].style.display = visibility[key] ? 'block' : 'none';
+        }
+    }
+}
+
+function updateForecastChart() {
+    const { departmentFilter, outliers: chartOutliersWarning, canvas: chartCanvas } = comparisonChartDom;
+
+    // График строим только на смонтированной странице сравнения
+    if (!chartCanvas || !chartCanvas.isConnected) {
+        return;
+    }
+
+    // Сначала решаем, что показать, а в style пишем один раз перед выходом
+    const visibility = { wrapper: true, warning: false, outliers: false, noData: false, canvas: true };
+
+    // Проверяем: выбран ли только один филиал (не "Все подразделения")
+    if (!departmentFilter.value || comparisonCount === 0) {
+        visibility.wrapper = false;
+        applyChartVisibility(visibility);
+        return;
+    }
+
+    // Группируем данные по датам для одного филиала: дата YYYY-MM-DD из API ->
+    // индекс первой строки с этой датой
+    const rowByDate = new Map();
+    for (let i = 0; i < comparisonCount; i++) {
+        const date = String(comparisonData.date[i]).slice(0, 10);
+        if (!rowByDate.has(date)) {
+            rowByDate.set(date, i);
+        }
+    }
+
+    // Сортируем даты по возрастанию (ISO-строки сортируются как даты)
+    const allDates = [...rowByDate.keys()].sort();
+
+    // Проверяем наличие данных
+    if (allDates.length === 0) {
+        visibility.noData = true;
+        visibility.canvas = false;
+        applyChartVisibility(visibility);
+        return;
+    }
+
+    // ОПТИМИЗАЦИЯ: Ограничиваем количество точек для производительности.
+    // Длинный период прореживается по LTTB: точки выбираются по всему периоду
+    // с сохранением пиков и провалов фактических продаж
+    const MAX_POINTS = 30;
+    let dates = allDates;
+    const showWarning = allDates.length > MAX_POINTS;
+
+    if (showWarning) {
+        const shape = allDates.map(date => {
+            const i = rowByDate.get(date);
+            return Number(comparisonData.actual_sales[i] ?? comparisonData.predicted_sales[i]) || 0;
+        });
+        dates = Array.from(lttbIndices(shape, MAX_POINTS), i => allDates[i]);
+    }
+
+    // Показываем предупреждение если данных много
+    visibility.warning = showWarning;
+
+    // Подготавливаем данные для графика
+    const predictedValues = dates.map(date => comparisonData.predicted_sales[rowByDate.get(date)]);
+    const actualValues = dates.map(date => comparisonData.actual_sales[rowByDate.get(date)]);
+
+    // ============= ИНТЕЛЛЕКТУАЛЬНАЯ ОБРАБОТКА ВЫБРОСОВ =============
+
+    // Собираем все значения (исключаем null/undefined)
+    const allValues = [...predictedValues, ...actualValues].filter(v => v != null && v > 0);
+
+    if (allValues.length === 0) {
+        visibility.noData = true;
+        visibility.canvas = false;
+        applyChartVisibility(visibility);
+        return;
+    }
+
+    // Одна сортировка даёт и процентили, и минимум с максимумом
+    const sortedValues = Float64Array.from(allValues).sort();
+    const minAll = sortedValues[0];
+    const maxAll = sortedValues[sortedValues.length - 1];
+
+    // Процентиль по уже отсортированному массиву (линейная интерполяция)
+    function percentile(sorted, p) {
+        const index = (p / 100) * (sorted.length - 1);
+        const lower = Math.floor(index);
+        const upper = Math.ceil(index);
+        const weight = index % 1;
+        return sorted[lower] * (1 - weight) + sorted[upper] * weight;
+    }
+
+    // Вычисляем 5-й и 95-й процентили для обрезки экстремальных значений
+    const p5 = percentile(sortedValues, 5);
+    const p95 = percentile(sortedValues, 95);
+    const originalRange = maxAll - minAll;
+    const clippedRange = p95 - p5;
+
+    // Определяем есть ли значительные выбросы (>3x от нормального диапазона)
+    const hasExtremeOutliers = originalRange / clippedRange > 3;
+
+    // Подготавливаем данные для отображения
+    let displayPredicted, displayActual, clippedCount = 0;
+    let minValue, maxValue;
+
+    if (hasExtremeOutliers) {
+        // Ограничиваем данные процентилями для лучшей читаемости; оба ряда
+        // обрабатываются за один проход
+        const clip = v => {
+            if (v == null) return null;
+            if (v < p5) {
+                clippedCount++;
+                return p5;
+            }
+            if (v > p95) {
+                clippedCount++;
+                return p95;
+            }
+            return v;
+        };
+        const pointCount = predictedValues.length;
+        displayPredicted = new Array(pointCount);
+        displayActual = new Array(pointCount);
+        for (let i = 0; i < pointCount; i++) {
+            displayPredicted[i] = clip(predictedValues[i]);
+            displayActual[i] = clip(actualValues[i]);
+        }
+
+        minValue = p5 * 0.95;
+        maxValue = p95 * 1.05;
+
+        // Показываем предупреждение об использовании логарифмической шкалы
+        chartOutliersWarning.innerHTML = `
+            📈 <strong>Логарифмическая шкала:</strong> 
+            График использует логарифмическую шкалу для лучшей читаемости данных с большими различиями. 
+            ${clippedCount} экстремальных значений ограничены границами 
+            ${formatNumber(p5)}₸ - ${formatNumber(p95)}₸.
+        `;
+        visibility.outliers = true;
+    } else {
+        // Используем исходные данные
+        displayPredicted = predictedValues;
+        displayActual = actualValues;
+        minValue = minAll * 0.95;
+        maxValue = maxAll * 1.05;
+    }
+
+    // Параметры оси Y с интеллектуальным выбором шкалы
+    const yAxis = {
+        type: hasExtremeOutliers ? 'logarithmic' : 'linear',
+        min: hasExtremeOutliers ? Math.max(1, minAll * 0.8) : minValue,
+        max: hasExtremeOutliers ? maxAll * 1.2 : maxValue,
+        title: hasExtremeOutliers ? 'Сумма продаж (₸) - логарифмическая шкала' : 'Сумма продаж (₸)',
+        maxTicksLimit: hasExtremeOutliers ? 6 : 8
+    };
+
+
+    // ============= ОБНОВЛЕНИЕ ГРАФИКА =============
+
+    // Исходные значения (до ограничения) для подсказок
+    forecastChartSource = { predicted: predictedValues, actual: actualValues };
+
+    // Холст должен быть видим до обновления: Chart.js измеряет его размер
+    applyChartVisibility(visibility);
+
+    // График создаётся один раз, дальше обновляются только данные и опции
+    const chart = forecastChart || (forecastChart = initForecastChart(chartCanvas));
+    const pointRadius = dates.length > 15 ? 2 : 4;
+
+    // Точки передаются уже в формате Chart.js ({x, y}, x — номер дня), поэтому
+    // разбор данных отключён; после LTTB даты идут неравномерно, и линейная
+    // ось показывает реальные промежутки между ними
+    const days = dates.map(date => Date.parse(date) / DAY_MS);
+    chart.data.datasets[0].data = days.map((x, k) => ({ x, y: displayPredicted[k] ?? null }));
+    chart.data.datasets[0].pointRadius = pointRadius;
+    chart.data.datasets[1].data = days.map((x, k) => ({ x, y: displayActual[k] ?? null }));
+    chart.data.datasets[1].pointRadius = pointRadius;
+    chart.options.scales.x.ticks.maxTicksLimit = Math.min(dates.length, 12);
+    // Опции оси меняем на месте: объект шкалы и callback подписей создаются один раз
+    const yOptions = chart.options.scales.y;
+    yOptions.type = yAxis.type;
+    yOptions.min = yAxis.min;
+    yOptions.max = yAxis.max;
+    yOptions.title.text = yAxis.title;
+    yOptions.ticks.maxTicksLimit = yAxis.maxTicksLimit;
+    chart.update('none');
+}
+
+const DAY_MS = 86400000;
+
+// Номер дня (x на графике сравнения) -> 'ДД.ММ.ГГГГ'
+function formatChartDay(day) {
+    return formatDate(new Date(day * DAY_MS).toISOString().slice(0, 10));
+}
+
+// Подписи делений осей графика сравнения
+function formatDayTick(value) {
+    // Форматируем дату как ДД.ММ; дробные деления без подписи
+    return Number.isInteger(value) ? formatChartDay(value).slice(0, 5) : '';
+}
+
+function formatAmountTick(value) {
+    if (value >= 1000000) {
+        return '₸ ' + (value / 1000000).toFixed(1) + 'М';
+    } else if (value >= 1000) {
+        return '₸ ' + (value / 1000).toFixed(0) + 'К';
+    }
+    return '₸ ' + formatNumber(value);
+}
+
+// Largest-Triangle-Three-Buckets: индексы threshold точек ряда values, которые
+// лучше всего сохраняют его форму. Первая и последняя точки остаются всегда,
+// из каждой промежуточной корзины берётся точка, образующая наибольший
+// треугольник с предыдущей выбранной и средним следующей корзины
+function lttbIndices(values, threshold) {
+    const n = values.length;
+    if (threshold >= n || threshold < 3) {
+        return Int32Array.from(values.keys());
+    }
+
+    const indices = new Int32Array(threshold);
+    const bucketSize = (n - 2) / (threshold - 2);
+    let previous = 0;
+
+    for (let bucket = 0; bucket < threshold - 2; bucket++) {
+        // Среднее следующей корзины (для последней — последняя точка)
+        const nextStart = Math.floor((bucket + 1) * bucketSize) + 1;
+        const nextEnd = Math.min(Math.floor((bucket + 2) * bucketSize) + 1, n);
+        let avgX = 0;
+        let avgY = 0;
+        for (let i = nextStart; i < nextEnd; i++) {
+            avgX += i;
+            avgY += values[i];
+        }
+        avgX /= nextEnd - nextStart;
+        avgY /= nextEnd - nextStart;
+
+        const start = Math.floor(bucket * bucketSize) + 1;
+        const end = Math.floor((bucket + 1) * bucketSize) + 1;
+        const previousY = values[previous];
+        let maxArea = -1;
+        let chosen = start;
+        for (let i = start; i < end; i++) {
+            const area = Math.abs((previous - avgX) * (values[i] - previousY) - (previous - i) * (avgY - previousY));
+            if (area > maxArea) {
+                maxArea = area;
+                chosen = i;
+            }
+        }
+
+        indices[bucket + 1] = chosen;
+        previous = chosen;
+    }
+
+    indices[threshold - 1] = n - 1;
+    return indices;
+}
+
+// Значения прогноза/факта до обрезки выбросов для текущих данных графика
+let forecastChartSource = { predicted: [], actual: [] };
+
+function initForecastChart(canvas) {
+    return new Chart(canvas.getContext('2d'), {
+        type: 'line',
+        data: {
+            labels: [],
+            datasets: [
+                {
+                    label: 'Прогноз',
+                    data: [],
+                    parsing: false,
+                    normalized: true,
+                    borderColor: '#3498db',
+                    backgroundColor: 'rgba(52, 152, 219, 0.1)',
+                    borderWidth: 2,
+                    fill: false,
+                    tension: 0.1,
+                    pointRadius: 4,
+                    pointHoverRadius: 6
+                },
+                {
+                    label: 'Факт',
+                    data: [],
+                    parsing: false,
+                    normalized: true,
+                    borderColor: '#27ae60',
+                    backgroundColor: 'rgba(39, 174, 96, 0.1)',
+                    borderWidth: 2,
+                    fill: false,
+                    tension: 0.1,
+                    pointRadius: 4,
+                    pointHoverRadius: 6
+                }
+            ]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            aspectRatio: 3,
+            interaction: {
+                intersect: false,
+                mode: 'index'
+            },
+            scales: {
+                x: {
+                    type: 'linear',
+                    title: {
+                        display: true,
+                        text: 'Дата'
+                    },
+                    ticks: {
+                        // ОПТИМИЗАЦИЯ: Читаемые подписи дат
+                        maxTicksLimit: 12,
+                        // Деления только на целых днях, даже на коротком периоде
+                        precision: 0,
+                        maxRotation: 45,
+                        minRotation: 0,
+                        callback: formatDayTick
+                    }
+                },
+                y: {
+                    type: 'linear',
+                    beginAtZero: false,
+                    title: {
+                        display: true,
+                        text: 'Сумма продаж (₸)'
+                    },
+                    ticks: {
+                        callback: formatAmountTick,
+                        maxTicksLimit: 8
+                    }
+                }
+            },
+            plugins: {
+                title: {
+                    display: false
+                },
+                legend: {
+                    display: true,
+                    position: 'top'
+                },
+                tooltip: {
+                    callbacks: {
+                        title: function(items) {
+                            return items.length ? formatChartDay(items[0].parsed.x) : '';
+                        },
+                        label: function(context) {
+                            // Показываем реальные значения в подсказках (до ограничения)
+                            const dataIndex = context.dataIndex;
+                            const datasetIndex = context.datasetIndex;
+                            let originalValue;
+
+                            if (datasetIndex === 0) {
+                                // Прогноз
+                                originalValue = forecastChartSource.predicted[dataIndex];
+                            } else {
+                                // Факт
+                                originalValue = forecastChartSource.actual[dataIndex];
+                            }
+
+                            if (originalValue == null) {
+                                return context.dataset.label + ': Нет данных';
+                            }
+
+                            const displayValue = context.parsed.y;
+                            const isClipped = Math.abs(originalValue - displayValue) > 1;
+
+                            let label = context.dataset.label + ': ₸ ' + formatNumber(originalValue);
+
+                            if (isClipped) {
+                                label += ' (на графике: ₸ ' + formatNumber(displayValue) + ')';
+                            }
+
+                            return label;
+                        }
+                    }
+                }
+            }
+        }
+    });
+}
+
+// Метрика модели с заданной точностью или 'N/A', если её нет в ответе
+function formatMetric(value, digits = 2, suffix = '') {
+    return value == null ? 'N/A' : value.toFixed(digits) + suffix;
+}
+
+async function loadModelInfo() {
+    const signal = startRequest('model-info');
+    try {
+        const modelInfo = await cachedFetchJson('/api/forecast/model/info', signal);
+
+        const infoDiv = document.getElementById('model-info');
+        if (modelInfo.status === 'loaded') {
+            let html = `
+                <p><strong>Статус модели:</strong> <span style="color: #27ae60;">✅ Загружена</span></p>
+                <p><strong>Тип модели:</strong> ${modelInfo.model_type}</p>
+                <p><strong>Количество признаков:</strong> ${modelInfo.n_features}</p>
+                <p><strong>Путь к модели:</strong> ${modelInfo.model_path}</p>
+            `;
+
+            // Если есть метрики обучения, показываем их
+            if (modelInfo.training_metrics) {
+                const metrics = modelInfo.training_metrics;
+                html += `
+                    <div style="margin-top: 20px; padding: 15px; background: #f0f8ff; border-radius: 8px; border: 1px solid #b0d4f0;">
+                        <h4 style="margin-top: 0; color: #2c3e50;">📊 Метрики последнего обучения (Модель v2.0):</h4>
+
+                        <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px; margin: 15px 0;">
+                            <div style="background: #fff3cd; padding: 12px; border-radius: 6px; border: 1px solid #ffeaa7;">
+                                <h5 style="margin: 0 0 8px 0; color: #856404;">📈 Validation (контроль обучения):</h5>
+                                <div style="font-size: 13px;">
+                                    <p style="margin: 3px 0;"><strong>MAE:</strong> ${formatMetric(metrics.val_mae)}</p>
+                                    <p style="margin: 3px 0;"><strong>MAPE:</strong> ${formatMetric(metrics.val_mape, 2, '%')}</p>
+                                    <p style="margin: 3px 0;"><strong>R²:</strong> ${formatMetric(metrics.val_r2, 4)}</p>
+                                    <p style="margin: 3px 0;"><strong>RMSE:</strong> ${formatMetric(metrics.val_rmse)}</p>
+                                </div>
+                            </div>
+
+                            <div style="background: #d1ecf1; padding: 12px; border-radius: 6px; border: 1px solid #7dd3fc;">
+                                <h5 style="margin: 0 0 8px 0; color: #0c5460;">🎯 Test (честная оценка):</h5>
+                                <div style="font-size: 13px;">
+                                    <p style="margin: 3px 0;"><strong>MAE:</strong> ${formatMetric(metrics.test_mae ?? metrics.mae)}</p>
+                                    <p style="margin: 3px 0;"><strong>MAPE:</strong> ${formatMetric(metrics.test_mape ?? metrics.mape, 2, '%')}</p>
+                                    <p style="margin: 3px 0;"><strong>R²:</strong> ${formatMetric(metrics.test_r2 ?? metrics.r2, 4)}</p>
+                                    <p style="margin: 3px 0;"><strong>RMSE:</strong> ${formatMetric(metrics.test_rmse ?? metrics.rmse)}</p>
+                                </div>
+                            </div>
+                        </div>
+
+                        <div style="margin-top: 15px; padding: 10px; background: #e7f3ff; border-radius: 6px; border-left: 4px solid #2196F3;">
+                            <p style="margin: 5px 0; font-size: 14px; color: #1976D2;">
+                                <strong>📍 Объяснение:</strong><br>
+                                • <strong>Validation</strong> - данные для контроля обучения (early stopping)<br>
+                                • <strong>Test</strong> - честная оценка на данных, которые модель никогда не видела<br>
+                                • Test метрики показывают реальную производительность на новых данных
+                            </p>
+                        </div>
+
+                        <div style="margin-top: 10px; font-size: 13px; color: #666;">
+                            <p style="margin: 2px 0;"><strong>📊 Размеры выборок:</strong></p>
+                            <p style="margin: 2px 0;">• Обучение: ${metrics.train_samples} записей</p>
+                            <p style="margin: 2px 0;">• Validation: ${metrics.val_samples || 'N/A'} записей</p>
+                            <p style="margin: 2px 0;">• Test: ${metrics.test_samples} записей</p>
+                        </div>
+                    </div>
+                `;
+            }
+
+            html += `
+                <div style="margin-top: 15px;">
+                    <button class="sync-btn" onclick="retrainModel()">🔄 Переобучить модель</button>
+                </div>
+            `;
+
+            infoDiv.innerHTML = html;
+        } else {
+            infoDiv.innerHTML = `
+                <p><strong>Статус модели:</strong> <span style="color: #e74c3c;">❌ Не загружена</span></p>
+                <p>Необходимо обучить модель перед использованием прогнозов.</p>
+                <div style="margin-top: 15px;">
+                    <button class="sync-btn" onclick="retrainModel()">🚀 Обучить модель</button>
+                </div>
+            `;
+        }
+    } catch (error) {
+        if (isAbortError(error)) return;
+        console.error('Error loading model info:', error);
+        document.getElementById('model-info').innerHTML = 
+            '<p style="color: #e74c3c;">Ошибка загрузки информации о модели</p>';
+    }
+}
+
+async function retrainModel() {
+    if (!confirm('Переобучение модели может занять несколько минут. Продолжить?')) return;
+
+    const infoDiv = document.getElementById('model-info');
+    const originalContent = infoDiv.innerHTML;
+    infoDiv.innerHTML = '<p>⏳ Идет обучение модели...</p>';
+
+    try {
+        const response = await fetch('/api/forecast/retrain', { method: 'POST', headers: AUTH_HEADERS });
+        const result = await response.json();
+
+        if (result.status === 'success') {
+            // Показываем временное сообщение об успешном обучении
+            infoDiv.innerHTML = `
+                <div style="padding: 15px; background: #d4edda; border-radius: 8px; border: 1px solid #c3e6cb; margin-bottom: 20px;">
+                    <p style="color: #155724; margin: 0;"><strong>✅ Модель успешно обучена!</strong></p>
+                </div>
+            `;
+
+            // Сразу загружаем обновленную информацию о модели
+            setTimeout(() => {
+                loadModelInfo();
+            }, 2000);
+        } else {
+            throw new Error(result.detail || 'Ошибка обучения');
+        }
+    } catch (error) {
+        console.error('Error retraining model:', error);
+        infoDiv.innerHTML = `
+            <div style="padding: 15px; background: #f8d7da; border-radius: 8px; border: 1px solid #f5c6cb; margin-bottom: 20px;">
+                <p style="color: #721c24; margin: 0;">❌ Ошибка обучения модели: ${error.message}</p>
+            </div>
+            ${originalContent}
+        `;
+    }
+}
@@ -0,0 +1,299 @@
+// "Продажи по дням" and "Продажи по часам" pages, loaded by admin.js (PAGE_SCRIPTS) when first opened
+
+// Elements of the two pages, looked up once when each is mounted
+const dailyDom = {};
+const hourlyDom = {};
+
+pageInitializers['daily-sales'] = function() {
+    dailyDom.startDate = document.getElementById('daily-start-date');
+    dailyDom.endDate = document.getElementById('daily-end-date');
+    dailyDom.departmentFilter = document.getElementById('daily-department-filter');
+    dailyDom.loading = document.getElementById('daily-loading');
+    dailyDom.totalCount = document.getElementById('daily-total-count');
+    dailyDom.tbody = document.getElementById('daily-sales-tbody');
+    dailyDom.table = createVirtualTable(dailyDom.tbody, 6);
+};
+
+// '00:00' ... '23:00'
+const HOUR_LABELS = Array.from({ length: 24 }, (_, hour) => `${String(hour).padStart(2, '0')}:00`);
+
+// Hour filter options, built once and cloned into the select
+const HOUR_OPTIONS = document.createDocumentFragment();
+HOUR_OPTIONS.appendChild(new Option('Все часы', ''));
+HOUR_LABELS.forEach((label, hour) => HOUR_OPTIONS.appendChild(new Option(label, hour)));
+
+pageInitializers['hourly-sales'] = function() {
+    hourlyDom.startDate = document.getElementById('hourly-start-date');
+    hourlyDom.endDate = document.getElementById('hourly-end-date');
+    hourlyDom.departmentFilter = document.getElementById('hourly-department-filter');
+    hourlyDom.hourFilter = document.getElementById('hourly-hour-filter');
+    hourlyDom.loading = document.getElementById('hourly-loading');
+    hourlyDom.totalCount = document.getElementById('hourly-total-count');
+    hourlyDom.tbody = document.getElementById('hourly-sales-tbody');
+    hourlyDom.table = createVirtualTable(hourlyDom.tbody, 7);
+    hourlyDom.chartWrapper = document.getElementById('hourly-chart-wrapper');
+    hourlyDom.chartTitle = document.getElementById('hourly-chart-title');
+    hourlyDom.chartNoData = document.getElementById('hourly-chart-no-data');
+    hourlyDom.canvas = document.getElementById('hourlySalesChart');
+    // The hour list never changes, so it is filled once per mount
+    populateHourFilter();
+};
+
+function populateHourFilter() {
+    hourlyDom.hourFilter.replaceChildren(HOUR_OPTIONS.cloneNode(true));
+}
+
+// Sales Data Loading Functions
+async function loadDailySales() {
+    const startDate = dailyDom.startDate.value;
+    const endDate = dailyDom.endDate.value;
+    const departmentId = dailyDom.departmentFilter.value;
+
+    if (!startDate || !endDate) {
+        alert('Пожалуйста, укажите даты начала и окончания');
+        return;
+    }
+
+    dailyDom.loading.classList.add('active');
+
+    try {
+        let url = `/api/sales/summary?from_date=${startDate}&to_date=${endDate}&limit=1000&format=columns`;
+        if (departmentId) {
+            url += `&department_id=${departmentId}`;
+        }
+
+        const salesData = await fetchLatestJson('daily-sales', url);
+
+        renderDailySalesTable(salesData);
+        dailyDom.totalCount.textContent = `Всего: ${salesData.id.length}`;
+
+    } catch (error) {
+        // Superseded by a newer load, which owns the table and the indicator
+        if (isAbortError(error)) return;
+        console.error('Error loading daily sales:', error);
+        resetVirtualTable(dailyDom.table);
+        dailyDom.tbody.innerHTML = 
+            '<tr><td colspan="6" class="no-data">Ошибка загрузки данных</td></tr>';
+    }
+    dailyDom.loading.classList.remove('active');
+}
+
+async function loadHourlySales() {
+    const startDate = hourlyDom.startDate.value;
+    const endDate = hourlyDom.endDate.value;
+    const departmentId = hourlyDom.departmentFilter.value;
+    const hour = hourlyDom.hourFilter.value;
+
+    if (!startDate || !endDate) {
+        alert('Пожалуйста, укажите даты начала и окончания');
+        return;
+    }
+
+    hourlyDom.loading.classList.add('active');
+
+    try {
+        let url = `/api/sales/hourly?from_date=${startDate}&to_date=${endDate}&limit=1000&format=columns`;
+        if (departmentId) {
+            url += `&department_id=${departmentId}`;
+        }
+        if (hour !== '') {
+            url += `&hour=${hour}`;
+        }
+
+        const salesData = await fetchLatestJson('hourly-sales', url);
+
+        renderHourlySalesTable(salesData);
+        hourlyDom.totalCount.textContent = `Всего: ${salesData.id.length}`;
+
+        // Update chart if department is selected
+        updateHourlySalesChart(salesData, departmentId);
+
+    } catch (error) {
+        // Superseded by a newer load, which owns the table and the indicator
+        if (isAbortError(error)) return;
+        console.error('Error loading hourly sales:', error);
+        resetVirtualTable(hourlyDom.table);
+        hourlyDom.tbody.innerHTML = 
+            '<tr><td colspan="7" class="no-data">Ошибка загрузки данных</td></tr>';
+    }
+    hourlyDom.loading.classList.remove('active');
+}
+
+function renderDailySalesTable(salesData) {
+    // salesData is columnar: { id: [...], department_id: [...], date: [...], ... }
+    const tbody = dailyDom.tbody;
+    const count = salesData.id.length;
+
+    if (count === 0) {
+        resetVirtualTable(dailyDom.table);
+        tbody.innerHTML = '<tr><td colspan="6" class="no-data">Нет данных для отображения</td></tr>';
+        return;
+    }
+
+    // Only the rows around the visible part of the table are in the DOM
+    dailyDom.table.container.scrollTop = 0;
+    setVirtualRows(dailyDom.table, count, i => {
+        const syncedAt = salesData.synced_at[i];
+
+        return '<tr>' +
+            `<td>${escapeHtml(salesData.id[i])}</td>` +
+            `<td>${escapeHtml(departmentName(salesData.department_id[i]))}</td>` +
+            `<td>${formatDate(salesData.date[i])}</td>` +
+            `<td>${formatNumber(salesData.total_sales[i])}</td>` +
+            `<td>${formatDateTime(salesData.created_at[i])}</td>` +
+            `<td>${syncedAt ? formatDateTime(syncedAt) : '-'}</td>` +
+            '</tr>';
+    });
+}
+
+function renderHourlySalesTable(salesData) {
+    // salesData is columnar: { id: [...], department_id: [...], hour: [...], ... }
+    const tbody = hourlyDom.tbody;
+    const count = salesData.id.length;
+
+    if (count === 0) {
+        resetVirtualTable(hourlyDom.table);
+        tbody.innerHTML = '<tr><td colspan="7" class="no-data">Нет данных для отображения</td></tr>';
+        return;
+    }
+
+    hourlyDom.table.container.scrollTop = 0;
+    setVirtualRows(hourlyDom.table, count, i => {
+        const syncedAt = salesData.synced_at[i];
+
+        return '<tr>' +
+            `<td>${escapeHtml(salesData.id[i])}</td>` +
+            `<td>${escapeHtml(departmentName(salesData.department_id[i]))}</td>` +
+            `<td>${formatDate(salesData.date[i])}</td>` +
+            `<td>${salesData.hour[i].toString().padStart(2, '0')}:00</td>` +
+            `<td>${formatNumber(salesData.sales_amount[i])}</td>` +
+            `<td>${formatDateTime(salesData.created_at[i])}</td>` +
+            `<td>${syncedAt ? formatDateTime(syncedAt) : '-'}</td>` +
+            '</tr>';
+    });
+}
+
+// Global variable for hourly chart
+let hourlySalesChart = null;
+
+
+function updateHourlySalesChart(salesData, departmentId) {
+    const { chartWrapper, chartTitle, chartNoData, canvas } = hourlyDom;
+
+    // Chart.js needs the canvas to be in the DOM (page is mounted lazily)
+    if (!canvas || !canvas.isConnected) {
+        return;
+    }
+
+    // Hide chart if no department selected
+    if (!departmentId) {
+        chartWrapper.style.display = 'none';
+        return;
+    }
+
+    // Show chart wrapper
+    chartWrapper.style.display = 'block';
+
+    // salesData was requested with this department_id, so every row belongs to
+    // it; sum by hour in one pass over the columns
+    const departmentRows = salesData.id.length;
+    const hourlyTotals = new Float64Array(24);
+    for (let i = 0; i < departmentRows; i++) {
+        hourlyTotals[salesData.hour[i] | 0] += Number(salesData.sales_amount[i]) || 0;
+    }
+
+    // Get date range for title
+    const startDate = hourlyDom.startDate.value;
+    const endDate = hourlyDom.endDate.value;
+    let dateRange = '';
+    if (startDate && endDate) {
+        if (startDate === endDate) {
+            dateRange = `дата: ${formatDate(startDate)}`;
+        } else {
+            dateRange = `период: ${formatDate(startDate)} - ${formatDate(endDate)}`;
+        }
+    }
+
+    // Update title
+    chartTitle.textContent = `Почасовая выручка, подразделение: ${departmentName(departmentId)}${dateRange ? ', ' + dateRange : ''}`;
+
+    if (departmentRows === 0) {
+        chartNoData.style.display = 'block';
+        canvas.style.display = 'none';
+        return;
+    }
+
+    chartNoData.style.display = 'none';
+    canvas.style.display = 'block';
+
+    // Reuse the chart instance; only the data changes between renders
+    const chart = hourlySalesChart || (hourlySalesChart = initHourlySalesChart(canvas));
+    chart.data.labels = HOUR_LABELS;
+    chart.data.datasets[0].data = Array.from(hourlyTotals);
+    chart.update('none');
+}
+
+function initHourlySalesChart(canvas) {
+    return new Chart(canvas.getContext('2d'), {
+        type: 'bar',
+        data: {
+            labels: [],
+            datasets: [{
+                label: 'Выручка',
+                data: [],
+                backgroundColor: 'rgba(52, 152, 219, 0.6)',
+                borderColor: 'rgba(52, 152, 219, 1)',
+                borderWidth: 1,
+                borderRadius: 4,
+                borderSkipped: false
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                title: {
+                    display: false
+                },
+                legend: {
+                    display: false
+                },
+                tooltip: {
+                    callbacks: {
+                        label: function(context) {
+                            const value = context.parsed.y;
+                            return 'Выручка: ₸ ' + formatNumber(value);
+                        }
+                    }
+                }
+            },
+            scales: {
+                x: {
+                    title: {
+                        display: true,
+                        text: 'Час дня'
+                    },
+                    grid: {
+                        display: false
+                    }
+                },
+                y: {
+                    title: {
+                        display: true,
+                        text: 'Сумма продаж (₸)'
+                    },
+                    beginAtZero: true,
+                    ticks: {
+                        callback: function(value) {
+                            return formatNumber(value);
+                        }
+                    }
+                }
+            },
+            interaction: {
+                intersect: false,
+                mode: 'index'
+            }
+        }
+    });
+}